@@ -1,5 +1,7 @@
 import os
 import logging
+from functools import lru_cache
+from typing import FrozenSet
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -20,20 +22,22 @@ class Settings:
     QBITTORRENT_PORT = int(os.getenv('QBITTORRENT_PORT', 8080))
     QBITTORRENT_USERNAME = os.getenv('QBITTORRENT_USERNAME', 'admin')
     QBITTORRENT_PASSWORD = os.getenv('QBITTORRENT_PASSWORD', 'admin')
+    # Keep-alive connections shared by all Web API calls
+    QBITTORRENT_POOL_SIZE = int(os.getenv('QBITTORRENT_POOL_SIZE', 10))
     
     # Download Paths
     MOVIES_DOWNLOAD_PATH = os.getenv('MOVIES_DOWNLOAD_PATH', 'E:\\Movies')
     TVSHOWS_DOWNLOAD_PATH = os.getenv('TVSHOWS_DOWNLOAD_PATH', 'E:\\TVShows')
     
     # Authorized Users - Improved parsing with better error handling
-    def _parse_authorized_users():
+    def _parse_authorized_users() -> FrozenSet[int]:
         """Parse authorized users from environment variable with better error handling."""
         authorized_users_str = os.getenv('AUTHORIZED_USERS', '')
         logger.info(f"Raw AUTHORIZED_USERS environment variable: '{authorized_users_str}'")
         
         if not authorized_users_str.strip():
             logger.warning("AUTHORIZED_USERS environment variable is empty or not set!")
-            return []
+            return frozenset()
         
         try:
             # Split by comma and clean up each user ID
@@ -49,20 +53,31 @@ class Settings:
                         logger.error(f"Failed to parse user ID '{user_id_str}': {e}")
             
             logger.info(f"Successfully parsed {len(user_ids)} authorized users: {user_ids}")
-            return user_ids
+            # Stored as a frozenset so the per-update authorization check is a hash lookup
+            return frozenset(user_ids)
             
         except Exception as e:
             logger.error(f"Error parsing AUTHORIZED_USERS: {e}")
-            return []
+            return frozenset()
     
     AUTHORIZED_USERS = _parse_authorized_users()
     
     # Pagination
     RESULTS_PER_PAGE = 8
     
+    # Completed-download checker: seconds between checks while downloads are
+    # in progress, and the longest the interval grows to while idle
+    CHECK_INTERVAL = int(os.getenv('CHECK_INTERVAL', 60))
+    CHECK_INTERVAL_MAX = int(os.getenv('CHECK_INTERVAL_MAX', 300))
+    
     # Prowlarr API
     PROWLARR_API_BASE_URL = "http://localhost:9696"
     
     # TMDB API Configuration
     TMDB_API_KEY = os.getenv('TMDB_API_KEY')  # This should be your Bearer token
-    TMDB_BASE_URL = "https://api.themoviedb.org/3" 
\ No newline at end of file
+    TMDB_BASE_URL = "https://api.themoviedb.org/3"
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings instance."""
+    return Settings()
@@ -15,7 +15,7 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from config.settings import Settings
+from config.settings import get_settings
 from services.telegram_bot import TelegramBot
 from utils.helpers import setup_logging, validate_telegram_token, validate_torrentleech_token
 
@@ -29,43 +29,36 @@ def main():
     
     try:
         # Validate configuration
-        settings = Settings()
+        settings = get_settings()
         
-        # Check required environment variables
-        if not settings.TELEGRAM_BOT_TOKEN:
-            logger.error("TELEGRAM_BOT_TOKEN not set in environment variables")
-            print("❌ Error: TELEGRAM_BOT_TOKEN not set. Please add it to your .env file.")
-            return 1
+        # Check required environment variables: (name, value, format validator, hint)
+        required = [
+            ("TELEGRAM_BOT_TOKEN", settings.TELEGRAM_BOT_TOKEN, validate_telegram_token,
+             "Please add it to your .env file."),
+            ("PROWLARR_API_KEY", settings.PROWLARR_API_KEY, None,
+             "Please add it to your .env file."),
+            ("AUTHORIZED_USERS", settings.AUTHORIZED_USERS, None,
+             "Please add your Telegram user ID to the .env file.")
+        ]
+        for name, value, validator, hint in required:
+            if not value:
+                logger.error(f"{name} not set in environment variables")
+                print(f"❌ Error: {name} not set. {hint}")
+                return 1
+            if validator and not validator(value):
+                logger.error(f"Invalid {name} format")
+                print(f"❌ Error: Invalid {name} format.")
+                return 1
         
-        if not settings.PROWLARR_API_KEY:
-            logger.error("PROWLARR_API_KEY not set in environment variables")
-            print("❌ Error: PROWLARR_API_KEY not set. Please add it to your .env file.")
-            return 1
-        
-        if not settings.AUTHORIZED_USERS:
-            logger.error("AUTHORIZED_USERS not set in environment variables")
-            print("❌ Error: AUTHORIZED_USERS not set. Please add your Telegram user ID to the .env file.")
-            return 1
-        
-        # Validate tokens
-        if not validate_telegram_token(settings.TELEGRAM_BOT_TOKEN):
-            logger.error("Invalid Telegram bot token format")
-            print("❌ Error: Invalid Telegram bot token format.")
-            return 1
-        
-        if not settings.PROWLARR_API_KEY:
-            logger.error("Invalid Prowlarr API key format")
-            print("❌ Error: Invalid Prowlarr API key format.")
-            return 1
-        
-        # Check if download directories exist
-        if not os.path.exists(settings.MOVIES_DOWNLOAD_PATH):
-            logger.warning(f"Movies download path does not exist: {settings.MOVIES_DOWNLOAD_PATH}")
-            print(f"⚠️  Warning: Movies download path does not exist: {settings.MOVIES_DOWNLOAD_PATH}")
-        
-        if not os.path.exists(settings.TVSHOWS_DOWNLOAD_PATH):
-            logger.warning(f"TV Shows download path does not exist: {settings.TVSHOWS_DOWNLOAD_PATH}")
-            print(f"⚠️  Warning: TV Shows download path does not exist: {settings.TVSHOWS_DOWNLOAD_PATH}")
+        # Check if download directories exist (one stat per path)
+        download_paths = [
+            ("Movies", settings.MOVIES_DOWNLOAD_PATH),
+            ("TV Shows", settings.TVSHOWS_DOWNLOAD_PATH)
+        ]
+        for label, path in download_paths:
+            if not os.path.isdir(path):
+                logger.warning(f"{label} download path does not exist: {path}")
+                print(f"⚠️  Warning: {label} download path does not exist: {path}")
         
         # Print configuration summary
         print("✅ Configuration validated successfully!")
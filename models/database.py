@@ -1,20 +1,64 @@
 import sqlite3
 import logging
-from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+import threading
+import time
+from typing import List, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+def _cutoff(hours: int) -> int:
+    """Unix timestamp of the moment N hours ago."""
+    return int(time.time()) - int(hours) * 3600
+
 class Database:
+    # Fixed statement text per status path so sqlite3's statement cache always hits
+    _SQL_UPDATE_COMPLETED = (
+        "UPDATE downloads SET status = ?, completed_at = strftime('%s', 'now') WHERE id = ?"
+    )
+    _SQL_UPDATE_STATUS = "UPDATE downloads SET status = ? WHERE id = ?"
+
     def __init__(self, db_path: str = "downloads.db"):
         self.db_path = db_path
+        # One long-lived connection shared by the bot handlers and the background
+        # checker/cleanup threads; access is serialized through the lock.
+        # Autocommit mode: single statements commit themselves, multi-statement
+        # work opens an explicit transaction.
+        self._conn = sqlite3.connect(db_path, check_same_thread=False,
+                                     isolation_level=None, cached_statements=256)
+        # Rows support both positional and column-name access without extra copies
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._apply_pragmas()
         self.init_database()
     
+    def _apply_pragmas(self):
+        """Apply connection-level PRAGMAs once at startup."""
+        try:
+            with self._lock:
+                cursor = self._conn.cursor()
+                cursor.execute('PRAGMA journal_mode=WAL')
+                cursor.execute('PRAGMA synchronous=NORMAL')
+                cursor.execute('PRAGMA temp_store=MEMORY')
+                cursor.execute('PRAGMA cache_size=-20000')
+                # Rows only hold torrent metadata; no need to zero freed pages
+                cursor.execute('PRAGMA secure_delete=OFF')
+        except Exception as e:
+            logger.error(f"Error applying database pragmas: {e}")
+    
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+    
     def init_database(self):
-        """Initialize the database with required tables."""
+        """Initialize the database with required tables.
+        
+        Errors are re-raised: the queries compare Unix timestamps, so running on a
+        table whose timestamps could not be migrated would silently match nothing.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._lock:
+                cursor = self._conn.cursor()
                 
                 # Downloads table
                 cursor.execute('''
@@ -26,10 +70,23 @@ class Database:
                         magnet_link TEXT NOT NULL,
                         download_path TEXT NOT NULL,
                         status TEXT DEFAULT 'downloading',
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        completed_at TIMESTAMP NULL
+                        created_at INTEGER NOT NULL DEFAULT (strftime('%s', 'now')),
+                        completed_at INTEGER NULL
                     )
                 ''')
+                self._migrate_timestamps(cursor)
+                
+                # Per-user time-window lookups (downloads list, statistics)
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_downloads_user_created
+                    ON downloads(user_id, created_at)
+                ''')
+                
+                # Age-based scans (cleanup, old downloads listing)
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_downloads_created
+                    ON downloads(created_at)
+                ''')
                 
                 # User sessions table
                 cursor.execute('''
@@ -42,22 +99,58 @@ class Database:
                     )
                 ''')
                 
-                conn.commit()
                 logger.info("Database initialized successfully")
         except Exception as e:
             logger.error(f"Error initializing database: {e}")
+            raise
+    
+    def _migrate_timestamps(self, cursor):
+        """Convert a downloads table with TIMESTAMP text columns to Unix integers."""
+        cursor.execute('PRAGMA table_info(downloads)')
+        column_types = {row['name']: row['type'].upper() for row in cursor.fetchall()}
+        if column_types.get('created_at') == 'INTEGER':
+            return
+        
+        logger.info("Migrating downloads timestamps to Unix time")
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            cursor.execute('''
+                CREATE TABLE downloads_new (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    title TEXT NOT NULL,
+                    torrent_id TEXT NOT NULL,
+                    magnet_link TEXT NOT NULL,
+                    download_path TEXT NOT NULL,
+                    status TEXT DEFAULT 'downloading',
+                    created_at INTEGER NOT NULL DEFAULT (strftime('%s', 'now')),
+                    completed_at INTEGER NULL
+                )
+            ''')
+            cursor.execute('''
+                INSERT INTO downloads_new
+                SELECT id, user_id, title, torrent_id, magnet_link, download_path, status,
+                       COALESCE(CAST(strftime('%s', created_at) AS INTEGER), strftime('%s', 'now')),
+                       CAST(strftime('%s', completed_at) AS INTEGER)
+                FROM downloads
+            ''')
+            cursor.execute('DROP TABLE downloads')
+            cursor.execute('ALTER TABLE downloads_new RENAME TO downloads')
+        except Exception:
+            self._conn.rollback()
+            raise
+        self._conn.commit()
     
     def add_download(self, user_id: int, title: str, torrent_id: str, 
                      magnet_link: str, download_path: str) -> int:
         """Add a new download to the database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._lock:
+                cursor = self._conn.cursor()
                 cursor.execute('''
                     INSERT INTO downloads (user_id, title, torrent_id, magnet_link, download_path)
                     VALUES (?, ?, ?, ?, ?)
                 ''', (user_id, title, torrent_id, magnet_link, download_path))
-                conn.commit()
                 return cursor.lastrowid
         except Exception as e:
             logger.error(f"Error adding download: {e}")
@@ -66,62 +159,75 @@ class Database:
     def update_download_status(self, download_id: int, status: str):
         """Update download status."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                if status == 'completed':
-                    cursor.execute('''
-                        UPDATE downloads 
-                        SET status = ?, completed_at = CURRENT_TIMESTAMP
-                        WHERE id = ?
-                    ''', (status, download_id))
-                else:
-                    cursor.execute('''
-                        UPDATE downloads 
-                        SET status = ?
-                        WHERE id = ?
-                    ''', (status, download_id))
-                conn.commit()
+            with self._lock:
+                cursor = self._conn.cursor()
+                sql = self._SQL_UPDATE_COMPLETED if status == 'completed' else self._SQL_UPDATE_STATUS
+                cursor.execute(sql, (status, download_id))
         except Exception as e:
             logger.error(f"Error updating download status: {e}")
     
-    def get_user_downloads(self, user_id: int, hours: int = 24) -> List[Dict]:
+    def get_user_downloads(self, user_id: int, hours: int = 24) -> List[sqlite3.Row]:
         """Get downloads for a user from the last N hours (default: 24 hours)."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._lock:
+                cursor = self._conn.cursor()
                 cursor.execute('''
-                    SELECT id, title, torrent_id, status, created_at, completed_at
+                    SELECT id, title, torrent_id, status,
+                           datetime(created_at, 'unixepoch') AS created_at,
+                           datetime(completed_at, 'unixepoch') AS completed_at
                     FROM downloads 
                     WHERE user_id = ?
-                    AND created_at >= datetime('now', '-{} hours')
-                    ORDER BY created_at DESC
-                '''.format(hours), (user_id,))
+                    AND downloads.created_at >= ?
+                    ORDER BY downloads.created_at DESC
+                ''', (user_id, _cutoff(hours)))
                 return cursor.fetchall()
         except Exception as e:
             logger.error(f"Error getting user downloads: {e}")
             return []
     
+    def get_download_by_id(self, download_id: int) -> Optional[sqlite3.Row]:
+        """Get a single download by its ID."""
+        try:
+            with self._lock:
+                cursor = self._conn.cursor()
+                cursor.execute('''
+                    SELECT id, user_id, title, torrent_id, magnet_link, download_path, status,
+                           datetime(created_at, 'unixepoch') AS created_at,
+                           datetime(completed_at, 'unixepoch') AS completed_at
+                    FROM downloads
+                    WHERE id = ?
+                ''', (download_id,))
+                return cursor.fetchone()
+        except Exception as e:
+            logger.error(f"Error getting download by id: {e}")
+            return None
+    
     def update_user_session(self, user_id: int, state: str, search_query: str = None, 
                            current_page: int = 0):
         """Update user session state."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._lock:
+                cursor = self._conn.cursor()
                 cursor.execute('''
-                    INSERT OR REPLACE INTO user_sessions 
+                    INSERT INTO user_sessions 
                     (user_id, current_state, search_query, current_page, last_activity)
                     VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(user_id) DO UPDATE SET
+                        current_state = excluded.current_state,
+                        search_query = excluded.search_query,
+                        current_page = excluded.current_page,
+                        last_activity = CURRENT_TIMESTAMP
                 ''', (user_id, state, search_query, current_page))
-                conn.commit()
-                logger.info(f"[DB] Updated session for user {user_id}: state={state}, query={search_query}, page={current_page}")
+                logger.info("[DB] Updated session for user %s: state=%s, query=%s, page=%s",
+                            user_id, state, search_query, current_page)
         except Exception as e:
             logger.error(f"Error updating user session: {e}")
     
     def get_user_session(self, user_id: int) -> Optional[Dict]:
         """Get user session state."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._lock:
+                cursor = self._conn.cursor()
                 cursor.execute('''
                     SELECT current_state, search_query, current_page
                     FROM user_sessions 
@@ -134,9 +240,9 @@ class Database:
                         'search_query': result[1],
                         'current_page': result[2]
                     }
-                    logger.debug(f"[DB] Retrieved session for user {user_id}: {session_data}")
+                    logger.debug("[DB] Retrieved session for user %s: %s", user_id, session_data)
                     return session_data
-                logger.debug(f"[DB] No session found for user {user_id}")
+                logger.debug("[DB] No session found for user %s", user_id)
                 return None
         except Exception as e:
             logger.error(f"Error getting user session: {e}")
@@ -145,44 +251,53 @@ class Database:
     def create_user_session(self, user_id: int, state: str = 'idle'):
         """Create a new user session."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._lock:
+                cursor = self._conn.cursor()
                 cursor.execute('''
-                    INSERT OR REPLACE INTO user_sessions 
+                    INSERT INTO user_sessions 
                     (user_id, current_state, last_activity)
                     VALUES (?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(user_id) DO UPDATE SET
+                        current_state = excluded.current_state,
+                        search_query = NULL,
+                        current_page = 0,
+                        last_activity = CURRENT_TIMESTAMP
                 ''', (user_id, state))
-                conn.commit()
-                logger.info(f"[DB] Created session for user {user_id} with state: {state}")
+                logger.info("[DB] Created session for user %s with state: %s", user_id, state)
         except Exception as e:
             logger.error(f"Error creating user session: {e}")
     
     def clear_user_session(self, user_id: int):
         """Clear user session state."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._lock:
+                cursor = self._conn.cursor()
                 cursor.execute('''
                     DELETE FROM user_sessions 
                     WHERE user_id = ?
                 ''', (user_id,))
-                conn.commit()
-                logger.info(f"[DB] Cleared session for user {user_id}")
+                logger.info("[DB] Cleared session for user %s", user_id)
         except Exception as e:
             logger.error(f"Error clearing user session: {e}") 
 
     def cleanup_old_downloads(self, hours: int = 24) -> int:
         """Clean up downloads older than N hours (default: 24 hours). Returns number of deleted records."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    DELETE FROM downloads 
-                    WHERE created_at < datetime('now', '-{} hours')
-                '''.format(hours))
-                deleted_count = cursor.rowcount
-                conn.commit()
-                logger.info(f"[DB] Cleaned up {deleted_count} downloads older than {hours} hours")
+            with self._lock:
+                cursor = self._conn.cursor()
+                # Take the write lock up front and commit the whole delete at once
+                cursor.execute('BEGIN IMMEDIATE')
+                try:
+                    cursor.execute('''
+                        DELETE FROM downloads 
+                        WHERE created_at < ?
+                    ''', (_cutoff(hours),))
+                    deleted_count = cursor.rowcount
+                except Exception:
+                    self._conn.rollback()
+                    raise
+                self._conn.commit()
+                logger.info("[DB] Cleaned up %s downloads older than %s hours", deleted_count, hours)
                 return deleted_count
         except Exception as e:
             logger.error(f"Error cleaning up old downloads: {e}")
@@ -191,39 +306,25 @@ class Database:
     def get_download_statistics(self, user_id: int, hours: int = 24) -> Dict:
         """Get download statistics for a user from the last N hours."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._lock:
+                cursor = self._conn.cursor()
                 
-                # Get total downloads in time period
+                # Count total, completed and downloading in a single pass over the time window
                 cursor.execute('''
-                    SELECT COUNT(*) FROM downloads 
-                    WHERE user_id = ? 
-                    AND created_at >= datetime('now', '-{} hours')
-                '''.format(hours), (user_id,))
-                total_downloads = cursor.fetchone()[0]
-                
-                # Get completed downloads
-                cursor.execute('''
-                    SELECT COUNT(*) FROM downloads 
-                    WHERE user_id = ? 
-                    AND status = 'completed'
-                    AND created_at >= datetime('now', '-{} hours')
-                '''.format(hours), (user_id,))
-                completed_downloads = cursor.fetchone()[0]
-                
-                # Get downloading count
-                cursor.execute('''
-                    SELECT COUNT(*) FROM downloads 
+                    SELECT COUNT(*),
+                           SUM(status = 'completed'),
+                           SUM(status = 'downloading')
+                    FROM downloads 
                     WHERE user_id = ? 
-                    AND status = 'downloading'
-                    AND created_at >= datetime('now', '-{} hours')
-                '''.format(hours), (user_id,))
-                downloading_count = cursor.fetchone()[0]
+                    AND created_at >= ?
+                ''', (user_id, _cutoff(hours)))
+                total_downloads, completed_downloads, downloading_count = cursor.fetchone()
                 
+                # SUM() yields NULL when no rows match
                 return {
                     'total_downloads': total_downloads,
-                    'completed_downloads': completed_downloads,
-                    'downloading_count': downloading_count,
+                    'completed_downloads': completed_downloads or 0,
+                    'downloading_count': downloading_count or 0,
                     'time_period_hours': hours
                 }
         except Exception as e:
@@ -235,17 +336,18 @@ class Database:
                 'time_period_hours': hours
             }
     
-    def get_all_downloads_older_than(self, hours: int) -> List[Tuple]:
+    def get_all_downloads_older_than(self, hours: int) -> List[sqlite3.Row]:
         """Get all downloads older than N hours (for cleanup purposes)."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._lock:
+                cursor = self._conn.cursor()
                 cursor.execute('''
-                    SELECT id, user_id, title, created_at
+                    SELECT id, user_id, title,
+                           datetime(created_at, 'unixepoch') AS created_at
                     FROM downloads 
-                    WHERE created_at < datetime('now', '-{} hours')
-                    ORDER BY created_at ASC
-                '''.format(hours))
+                    WHERE downloads.created_at < ?
+                    ORDER BY downloads.created_at ASC
+                ''', (_cutoff(hours),))
                 return cursor.fetchall()
         except Exception as e:
             logger.error(f"Error getting old downloads: {e}")
@@ -1,5 +1,24 @@
-from .telegram_bot import TelegramBot
-from .prowlarr_client import ProwlarrClient
-from .qbittorrent_client import QBittorrentClient
+import importlib
 
-__all__ = ['TelegramBot', 'ProwlarrClient', 'QBittorrentClient'] 
\ No newline at end of file
+# Submodules are imported on first attribute access so that using one client
+# does not pull in the dependencies of all the others.
+_LAZY_IMPORTS = {
+    'TelegramBot': '.telegram_bot',
+    'ProwlarrClient': '.prowlarr_client',
+    'QBittorrentClient': '.qbittorrent_client',
+}
+
+__all__ = ['TelegramBot', 'ProwlarrClient', 'QBittorrentClient']
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,63 +1,162 @@
 import requests
 import logging
 import re
-from typing import List, Dict, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Optional, Tuple
+from urllib3.util.retry import Retry
 from config.settings import Settings
+from services.qbittorrent_client import QBittorrentClient, TorrentView
 import json
 
+try:
+    # Optional: faster parsing of large search responses
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 MAX_SIZE_BYTES = 150 * 1024 * 1024 * 1024  # 150GB
 MIN_SEEDERS = 1  # Only show torrents with at least this many seeders
+EXISTING_TORRENTS_TTL = 10  # Seconds to reuse the qBittorrent torrent list between searches
+SEARCH_CACHE_TTL = 60  # Seconds to reuse a Prowlarr response for further pages of the same search
+
+# Fields of a Prowlarr search result that are actually used
+_RESULT_FIELDS = ('guid', 'link', 'downloadUrl', 'title', 'size', 'seeders', 'leechers',
+                  'categories', 'indexerFlags')
 
 MOVIE_CATEGORIES = [2000, 2010, 2030, 2040, 2045, 2050, 2070, 2080]
 TV_EPISODE_CATEGORIES = [100032]
 TV_BOXSET_CATEGORIES = [100027]
 
+# Category IDs that map to a result category label
+_CAT_MAP = {2000: 'movies', 5000: 'tv', 100027: 'tv_boxsets', 100032: 'tv_episodes'}
+
+# Split keywords — what marks the end of a title in a release name
+_TITLE_SPLIT_RE = re.compile('|'.join([
+    r'\b\d{4}\b',                   # Year like 2003
+    r'\b(720|1080|2160)p\b',        # Resolutions
+    r'\b(UHD|HDR|HDR10|DV|SDR)\b',
+    r'\b(BluRay|WEB[- ]?DL|HDRip|DVDRip|HDTV|NF|AMZN)\b',
+    r'\b(HEVC|H\.?264|H\.?265|x264|x265)\b',
+    r'\b(DTS|DDP?|AAC|TrueHD|FLAC)\b',
+    r'\b(MA|ATMOS|5\.1|7\.1|2\.0|2\.1|Mono|Stereo)\b',
+    r'\b(REMUX|HYBRID|REPACK|EXTENDED|PROPER|UNRATED|LIMITED)\b',
+    r'-[A-Za-z0-9]+$',              # Release group
+]), re.IGNORECASE)
+_EXT_RE = re.compile(r'\.[a-z0-9]{2,4}$', re.IGNORECASE)
+_DOTS_RE = re.compile(r'[._]+')
+_NONWORD_RE = re.compile(r'[^\w.]')
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+# Title markers for freeleech releases ('freeleech', 'free leech', 'free-leech'
+# and 'free_leech' all contain 'free', so they need no alternatives of their own)
+_FREELEECH_RE = re.compile(r'free|fl|0%|0x', re.IGNORECASE)
+
+def _toi(value, default: int = 0) -> int:
+    """Coerce a numeric API field to int, falling back to default."""
+    if type(value) is int:
+        return value
+    try:
+        if isinstance(value, str) and value.isdigit():
+            return int(value)
+        return int(float(value))
+    except Exception:
+        return default
+
+# Release metadata shown for each result, found in a single scan of the title
+_QUALITY_PRIORITY = ['BluRay', 'WEB-DL', 'HDRip', 'BRRip', 'DVDRip', 'HDTV']
+_CODEC_PRIORITY = ['x264', 'x265', 'H.264', 'H.265', 'AVC', 'HEVC']
+_QUALITY_RANK = {q.lower(): (i, q) for i, q in enumerate(_QUALITY_PRIORITY)}
+_CODEC_RANK = {c.lower(): (i, c) for i, c in enumerate(_CODEC_PRIORITY)}
+# Resolution stays case-sensitive ("1080p", not "1080P"); quality and codec names
+# match in any case
+_META_RE = re.compile(
+    r'\((?P<year>\d{4})\)'
+    r'|(?P<resolution>\d{3,4}p)'
+    r'|(?P<quality>(?i:' + '|'.join(re.escape(q) for q in _QUALITY_PRIORITY) + '))'
+    r'|(?P<codec>(?i:' + '|'.join(re.escape(c) for c in _CODEC_PRIORITY) + '))'
+)
+
+def _scan_meta(title: str) -> Tuple[Optional[str], ...]:
+    """Extract (year, resolution, quality, codec, release group) from a torrent title."""
+    year = resolution = None
+    quality = codec = None
+    for match in _META_RE.finditer(title):
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'year':
+            year = year or value
+        elif kind == 'resolution':
+            resolution = resolution or value
+        elif kind == 'quality':
+            # Several qualities may appear; keep the highest-priority one
+            rank = _QUALITY_RANK[value.lower()]
+            quality = min(quality, rank) if quality else rank
+        else:
+            rank = _CODEC_RANK[value.lower()]
+            codec = min(codec, rank) if codec else rank
+    
+    # Release group is the alphanumeric tail after the last dash
+    tail = title.rpartition('-')[2] if '-' in title else ''
+    group = tail if tail.isascii() and tail.isalnum() else None
+    
+    return (
+        year,
+        resolution,
+        quality[1] if quality else None,
+        codec[1] if codec else None,
+        group
+    )
+
 class ProwlarrClient:
-    def __init__(self):
+    def __init__(self, qbittorrent_client: Optional[QBittorrentClient] = None):
         self.api_key = Settings.PROWLARR_API_KEY or ''
         self.base_url = str(Settings.PROWLARR_BASE_URL or '')
         self.session = requests.Session()
         self.session.headers['X-Api-Key'] = self.api_key
         self.session.headers['accept'] = 'application/json'
+        # Pooled keep-alive connections, retrying GETs on transient server errors
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504),
+                      allowed_methods=frozenset(['GET']))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=10, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self.indexer_ids = '1'  # Default indexer ID
+        # Shared qBittorrent client for duplicate checks (created on first use if not given)
+        self.qb_client = qbittorrent_client
+        self._existing_cache = (0.0, [])  # (fetched at, torrents) for duplicate checks
+        # (query, category) -> (fetched at, raw Prowlarr results)
+        self._search_cache: Dict[Tuple[str, str], Tuple[float, List[Dict]]] = {}
     
-    def _extract_title(self, filename: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _extract_title(filename: str) -> str:
         """Extract the clean title from a filename by removing metadata."""
         # Remove file extension if present
-        filename = re.sub(r'\.[a-z0-9]{2,4}$', '', filename, flags=re.IGNORECASE)
-
-        # Define split keywords — what marks the end of the title
-        split_keywords = [
-            r'\b\d{4}\b',                   # Year like 2003
-            r'\b(720|1080|2160)p\b',        # Resolutions
-            r'\b(UHD|HDR|HDR10|DV|SDR)\b',
-            r'\b(BluRay|WEB[- ]?DL|HDRip|DVDRip|HDTV|NF|AMZN)\b',
-            r'\b(HEVC|H\.?264|H\.?265|x264|x265)\b',
-            r'\b(DTS|DDP?|AAC|TrueHD|FLAC)\b',
-            r'\b(MA|ATMOS|5\.1|7\.1|2\.0|2\.1|Mono|Stereo)\b',
-            r'\b(REMUX|HYBRID|REPACK|EXTENDED|PROPER|UNRATED|LIMITED)\b',
-            r'-[A-Za-z0-9]+$',              # Release group
-        ]
-
-        pattern = re.compile('|'.join(split_keywords), re.IGNORECASE)
+        filename = _EXT_RE.sub('', filename)
 
         # Replace underscores and dots with space
-        clean = re.sub(r'[._]+', ' ', filename)
+        clean = _DOTS_RE.sub(' ', filename)
 
         # Split on the first metadata keyword match
-        parts = pattern.split(clean, maxsplit=1)
+        parts = _TITLE_SPLIT_RE.split(clean, maxsplit=1)
         title = parts[0].strip()
 
         return title
     
-    def _create_search_pattern(self, title: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _create_search_pattern(title: str) -> str:
         """Convert title to dot-separated pattern for duplicate detection."""
-        # Replace spaces with dots and clean up
-        pattern = re.sub(r'\s+', '.', title.strip())
+        # Replace whitespace runs with dots (split() also drops leading/trailing whitespace)
+        pattern = '.'.join(title.split())
         # Remove any remaining special characters except dots
-        pattern = re.sub(r'[^\w.]', '', pattern)
+        pattern = _NONWORD_RE.sub('', pattern)
         return pattern.lower()
     
     def _is_duplicate(self, search_pattern: str, torrent_name: str) -> bool:
@@ -72,9 +171,11 @@ class ProwlarrClient:
         is_duplicate = search_pattern in torrent_pattern
         
         if is_duplicate:
-            logger.info(f"[Prowlarr] DUPLICATE DETECTED - Search pattern: '{search_pattern}' found in torrent: '{torrent_name}' (pattern: '{torrent_pattern}')")
+            logger.info("[Prowlarr] DUPLICATE DETECTED - Search pattern: '%s' found in torrent: '%s' (pattern: '%s')",
+                        search_pattern, torrent_name, torrent_pattern)
         else:
-            logger.debug(f"[Prowlarr] No duplicate - Search pattern: '{search_pattern}' not found in torrent: '{torrent_name}' (pattern: '{torrent_pattern}')")
+            logger.debug("[Prowlarr] No duplicate - Search pattern: '%s' not found in torrent: '%s' (pattern: '%s')",
+                         search_pattern, torrent_name, torrent_pattern)
         
         return is_duplicate
     
@@ -111,14 +212,43 @@ class ProwlarrClient:
             # Add categories as multiple parameters
             if category_ids:
                 params['categories'] = [str(cat_id) for cat_id in category_ids]
-            logger.info(f"[Prowlarr] Request URL: {search_url}")
-            logger.info(f"[Prowlarr] Request params: {params}")
-            response = self.session.get(search_url, params=params)
-            logger.info(f"[Prowlarr] Response status: {response.status_code}")
-            response.raise_for_status()
-            data = response.json()
-            return self._format_search_results(data, page, results_per_page, search_pattern)
-        except requests.exceptions.RequestException as e:
+            
+            # Results are paginated locally, so page changes can reuse the last response
+            cache_key = (query, category or '')
+            now = time.monotonic()
+            cached = self._search_cache.get(cache_key)
+            if cached and now - cached[0] < SEARCH_CACHE_TTL:
+                logger.info(f"[Prowlarr] Using cached response for: {query}")
+                data = cached[1]
+                existing_torrents = self._get_existing_torrents()
+            else:
+                logger.info(f"[Prowlarr] Request URL: {search_url}")
+                logger.info(f"[Prowlarr] Request params: {params}")
+                # The qBittorrent lookup for duplicate checks is independent of the search,
+                # so run it alongside the Prowlarr request
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    existing_future = executor.submit(self._get_existing_torrents)
+                    response = self.session.get(search_url, params=params)
+                    logger.info(f"[Prowlarr] Response status: {response.status_code}")
+                    response.raise_for_status()
+                    data = _json_loads(response.content)
+                    existing_torrents = existing_future.result()
+                # Keep only the fields we read so cached responses stay small
+                if isinstance(data, list):
+                    data = [
+                        {key: item[key] for key in _RESULT_FIELDS if key in item}
+                        if isinstance(item, dict) else item
+                        for item in data
+                    ]
+                # Drop expired responses before storing the new one
+                self._search_cache = {
+                    key: entry for key, entry in self._search_cache.items()
+                    if now - entry[0] < SEARCH_CACHE_TTL
+                }
+                self._search_cache[cache_key] = (now, data)
+            return self._format_search_results(data, page, results_per_page, search_pattern, existing_torrents)
+        # ValueError covers malformed JSON, which response.json() used to raise as a RequestException
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error(f"Error searching Prowlarr: {e}")
             return {
                 'torrents': [],
@@ -135,98 +265,99 @@ class ProwlarrClient:
     
     def _is_freeleech(self, item: dict) -> bool:
         flags = item.get('indexerFlags', [])
-        if isinstance(flags, list) and 'freeleech' in [str(f).lower() for f in flags]:
+        if isinstance(flags, list) and any(str(f).lower() == 'freeleech' for f in flags):
             return True
-        title = str(item.get('title', ''))
-        freeleech_indicators = [
-            'freeleech', 'fl', 'free', '0%', '0x', 'free leech',
-            'free-leech', 'free_leech'
-        ]
-        title_lower = title.lower()
-        return any(indicator in title_lower for indicator in freeleech_indicators)
+        return _FREELEECH_RE.search(str(item.get('title', ''))) is not None
     
-    def _format_search_results(self, data: List[Dict], page: int, results_per_page: int, search_pattern: str = None) -> Dict:
-        torrents = []
-        # Get existing downloads from qBittorrent for duplicate checking
-        existing_torrents = []
+    def _get_existing_torrents(self) -> List[TorrentView]:
+        """Get existing downloads from qBittorrent for duplicate checking."""
         try:
-            from services.qbittorrent_client import QBittorrentClient
-            qb_client = QBittorrentClient()
-            existing_torrents = qb_client.get_all_torrents()
+            now = time.monotonic()
+            fetched_at, cached = self._existing_cache
+            if now - fetched_at < EXISTING_TORRENTS_TTL:
+                return cached
+            if self.qb_client is None:
+                self.qb_client = QBittorrentClient.get_instance()
+            existing_torrents = self.qb_client.get_all_torrents()
+            self._existing_cache = (now, existing_torrents)
+            return existing_torrents
         except Exception as e:
             logger.warning(f"[Prowlarr] Could not get qBittorrent downloads for duplicate check: {e}")
+            return []
+    
+    def _format_search_results(self, data: List[Dict], page: int, results_per_page: int,
+                               search_pattern: str = None, existing_torrents: List[TorrentView] = None) -> Dict:
+        torrents = []
+        existing_torrents = existing_torrents or []
+        
+        # Normalize existing torrent titles once instead of once per API result
+        existing_names = [t.name for t in existing_torrents]
+        existing_norm = [self._extract_title(name).replace(' ', '.').lower() for name in existing_names]
+        # Exact normalized matches are the common case; resolve them with one dict lookup
+        existing_pairs = list(zip(existing_norm, existing_names))
+        existing_exact = {}
+        for existing_normalized, existing_name in existing_pairs:
+            existing_exact.setdefault(existing_normalized, existing_name)
+        # Lets a single substring scan test a result against every existing title
+        existing_joined = "\x00".join(existing_norm)
         
         # Process all items from API first
         for item in data:
             try:
-                size = item.get('size', 0)
-                try:
-                    size = int(float(size))
-                except Exception:
-                    size = 0
+                # Only the fields needed by the cheap filters are read up front;
+                # everything else is computed for surviving results
+                get = item.get
+                size = _toi(get('size', 0))
                 if size >= MAX_SIZE_BYTES:
                     continue  # Skip torrents >= 150GB
-                seeders = item.get('seeders', 0)
-                leechers = item.get('leechers', 0)
-                try:
-                    seeders = int(float(seeders))
-                except Exception:
-                    seeders = 0
-                try:
-                    leechers = int(float(leechers))
-                except Exception:
-                    leechers = 0
+                seeders = _toi(get('seeders', 0))
                 if seeders < MIN_SEEDERS:
                     continue  # Skip torrents with too few seeders
                 
                 # Check for duplicates against qBittorrent downloads if search pattern is provided
-                torrent_name = str(item.get('title', ''))
+                torrent_name = str(get('title', ''))
                 if existing_torrents:
-                    is_duplicate = False
                     # Extract clean title from the search result using shared script
                     clean_search_result = self._extract_title(torrent_name)
                     # Replace spaces with dots for comparison
                     search_result_normalized = clean_search_result.replace(' ', '.').lower()
                     
-                    for existing_torrent in existing_torrents:
-                        # Extract clean title from existing torrent using shared script
-                        clean_existing = self._extract_title(existing_torrent['name'])
-                        # Replace spaces with dots for comparison
-                        existing_normalized = clean_existing.replace(' ', '.').lower()
-                        
-                        # Check if the normalized search result is present in existing torrent
-                        if search_result_normalized in existing_normalized or existing_normalized in search_result_normalized:
-                            is_duplicate = True
-                            logger.info(f"[Prowlarr] Skipping duplicate torrent: '{torrent_name}' (matches: '{existing_torrent['name']}')")
-                            break
+                    exact_match = existing_exact.get(search_result_normalized)
+                    if exact_match is not None:
+                        logger.info("[Prowlarr] Skipping duplicate torrent: '%s' (matches: '%s')", torrent_name, exact_match)
+                        continue
                     
-                    if is_duplicate:
+                    # Fall back to substring containment in either direction; only the
+                    # existing-inside-result direction needs a per-title loop
+                    if search_result_normalized in existing_joined:
+                        matches = (name for norm, name in existing_pairs if search_result_normalized in norm)
+                    else:
+                        matches = (name for norm, name in existing_pairs if norm in search_result_normalized)
+                    existing_name = next(matches, None)
+                    if existing_name is not None:
+                        logger.info("[Prowlarr] Skipping duplicate torrent: '%s' (matches: '%s')", torrent_name, existing_name)
                         continue
                 
-                categories = item.get('categories', [])
-                if not isinstance(categories, list):
-                    categories = []
-                if categories and isinstance(categories[0], int):
-                    categories = [{'id': c, 'name': str(c)} for c in categories]
-                formatted_torrent = {
-                    'id': item.get('guid', item.get('link', '')),
+                leechers = _toi(get('leechers', 0))
+                year, resolution, quality, codec, group = _scan_meta(torrent_name)
+                torrents.append({
+                    'id': get('guid', get('link', '')),
                     'name': torrent_name,
                     'size': self._format_size(size),
                     'seeders': seeders,
                     'leechers': leechers,
-                    'category': self._get_category(categories),
+                    'category': self._get_category(get('categories', [])),
                     'freeleech': self._is_freeleech(item),
-                    'year': self._extract_year(torrent_name),
-                    'quality': self._extract_quality(torrent_name),
-                    'resolution': self._extract_resolution(torrent_name),
-                    'codec': self._extract_codec(torrent_name),
-                    'group': self._extract_group(torrent_name),
-                    'magnet_link': item.get('link', ''),
-                    'download_url': item.get('downloadUrl', '')
-                }
-                torrents.append(formatted_torrent)
+                    'year': year,
+                    'quality': quality,
+                    'resolution': resolution,
+                    'codec': codec,
+                    'group': group,
+                    'magnet_link': get('link', ''),
+                    'download_url': get('downloadUrl', '')
+                })
             except Exception as e:
-                logger.error(f"[Prowlarr] Error parsing item: {item}\nException: {e}")
+                logger.error("[Prowlarr] Error parsing item: %s\nException: %s", item, e)
                 continue
         
         # Now paginate the filtered results locally
@@ -248,61 +379,22 @@ class ProwlarrClient:
             'current_page': page,
             'total_results': total_filtered_results
         }
-    def _get_category(self, categories: List[Dict]) -> str:
-        if not categories:
+    def _get_category(self, categories: List) -> str:
+        # Prowlarr returns either category objects or bare integer IDs
+        if not categories or not isinstance(categories, list):
             return 'unknown'
         for cat in categories:
-            if isinstance(cat, dict):
-                if cat.get('id') == 2000:
-                    return 'movies'
-                elif cat.get('id') == 5000:
-                    return 'tv'
-                elif cat.get('id') == 100027:
-                    return 'tv_boxsets'
-                elif cat.get('id') == 100032:
-                    return 'tv_episodes'
+            cat_id = cat.get('id') if isinstance(cat, dict) else cat
+            name = _CAT_MAP.get(cat_id)
+            if name:
+                return name
         return 'other'
-    def _extract_year(self, title: str) -> Optional[str]:
-        import re
-        year_match = re.search(r'\((\d{4})\)', title)
-        if year_match:
-            return year_match.group(1)
-        return None
-    def _extract_quality(self, title: str) -> Optional[str]:
-        quality_patterns = ['BluRay', 'WEB-DL', 'HDRip', 'BRRip', 'DVDRip', 'HDTV']
-        title_lower = title.lower()
-        for quality in quality_patterns:
-            if quality.lower() in title_lower:
-                return quality
-        return None
-    def _extract_resolution(self, title: str) -> Optional[str]:
-        import re
-        resolution_match = re.search(r'(\d{3,4}p)', title)
-        if resolution_match:
-            return resolution_match.group(1)
-        return None
-    def _extract_codec(self, title: str) -> Optional[str]:
-        codec_patterns = ['x264', 'x265', 'H.264', 'H.265', 'AVC', 'HEVC']
-        title_lower = title.lower()
-        for codec in codec_patterns:
-            if codec.lower() in title_lower:
-                return codec
-        return None
-    def _extract_group(self, title: str) -> Optional[str]:
-        import re
-        group_match = re.search(r'-([A-Za-z0-9]+)$', title)
-        if group_match:
-            return group_match.group(1)
-        return None
     def _format_size(self, size_bytes: int) -> str:
         if size_bytes == 0:
             return "0 B"
-        size_names = ["B", "KB", "MB", "GB", "TB"]
-        i = 0
-        while size_bytes >= 1024 and i < len(size_names) - 1:
-            size_bytes /= 1024.0
-            i += 1
-        return f"{size_bytes:.1f} {size_names[i]}"
+        # Each factor of 1024 is 10 bits, so the unit index comes straight from the bit length
+        i = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1) if size_bytes > 0 else 0
+        return f"{size_bytes / (1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
     def search_movies(self, query: str, page: int = 0) -> Dict:
         return self.search_torrents(query, category='movies', freeleech_only=True, page=page)
     def search_tv_episodes(self, query: str, page: int = 0) -> Dict:
@@ -3,29 +3,226 @@ import logging
 import asyncio
 import os
 import re
-from typing import Dict, Optional, List
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, partial
+from operator import itemgetter
+from typing import Dict, Optional, List, Set, Tuple
 from config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# Connection pool for the Web API session; concurrent callers wait for a free
+# keep-alive connection instead of opening throwaway ones
+QBITTORRENT_POOL_SIZE = Settings.QBITTORRENT_POOL_SIZE
+# (connect, read) timeout in seconds for every Web API request
+QBITTORRENT_TIMEOUT = (5, 30)
+# Seconds the local torrent mirror is trusted before asking qBittorrent for changes,
+# so bursts of lookups share one request
+TORRENTS_CACHE_TTL = 2.0
+# Seconds the RSS feed listing is reused when assigning feeds to new rules
+FEEDS_CACHE_TTL = 60
+# Seconds the feed URL assigned to new rules is reused
+FEED_URL_CACHE_TTL = 300
+# Seconds the auto-download rule list is reused between lookups
+RULES_CACHE_TTL = 5
+# Rules created concurrently by create_rules_bulk
+RULES_BULK_CONCURRENCY = 8
+# Polling for a just-added torrent to appear: attempts, and the first and
+# largest delay in seconds between them (the delay doubles each attempt)
+ADD_POLL_ATTEMPTS = 10
+ADD_POLL_BASE_DELAY = 0.2
+ADD_POLL_MAX_DELAY = 2.0
+
+# Torrent summaries returned by get_all_torrents
+TorrentView = namedtuple('TorrentView', 'hash name size progress state save_path category')
+_get_summary_fields = itemgetter(*TorrentView._fields)
+
+# Torrent details returned by get_torrents_info/get_torrent_info
+TorrentInfo = namedtuple('TorrentInfo', 'hash name size progress download_speed upload_speed '
+                                        'state save_path category ratio eta num_seeds num_leechs')
+_get_info_fields = itemgetter('hash', 'name', 'size', 'progress', 'dlspeed', 'upspeed', 'state',
+                              'save_path', 'category', 'ratio', 'eta', 'num_seeds', 'num_leechs')
+
+# Hex info hash in a magnet link
+_BTIH_RE = re.compile(r'btih:([a-fA-F0-9]{40})', re.IGNORECASE)
+
+# "Show Name <marker>" layouts tried in order by _extract_tv_show_name
+_TV_NAME_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'^(.+?)\s+S\d+',                 # Show Name S01 (most common)
+    r'^(.+?)\s+Season\s+\d+',         # Show Name Season 1
+    r'^(.+?)\s+S\d+E\d+',             # Show Name S01E01
+    r'^(.+?)\s+Complete\s+Series',    # Show Name Complete Series
+    r'^(.+?)\s+Collection',           # Show Name Collection
+))
+# Torrent metadata stripped when no layout above matches. Each group is one
+# alternation, so the title is scanned once per group; the end-anchored group
+# name pattern runs between them because it only matches once the metadata
+# after it is gone, and must not run after the year is removed
+_TV_METADATA_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in (
+    # Season patterns
+    r'\s+S\d{1,2}(?:-S?\d{1,2})?',
+    r'\s+Season\s+\d+',
+    r'\s+S\d{1,2}E\d{1,2}',
+    # Quality patterns
+    r'\s+\d{3,4}p',
+    r'\s+4K',
+    r'\s+UHD',
+    # Source patterns
+    r'\s+(?:BluRay|WEBRip|HDTV|DVDRip|BRRip)',
+    # Audio patterns
+    r'\s+(?:DDP\d+|DD\d+Ch|AAC|AC3)',
+    # Video codec patterns
+    r'\s+(?:HEVC|x264|x265|AVC)',
+    # Bit depth patterns
+    r'\s+\d+Bit',
+    # Collection/Complete patterns
+    r'\s+(?:Collection|Complete|Boxset|Box\s*Set|Series)',
+)), re.IGNORECASE)
+# Group names (usually at the end with - or .)
+_TV_GROUP_SUFFIX_RE = re.compile(r'\s*[-.]\s*[A-Za-z0-9]+$')
+_TV_TRAILING_METADATA_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in (
+    # Additional descriptive text
+    r'\s+(?:The\s+)?(?:Uncensored|Extended|Director\'s\s+Cut|Special\s+Edition)',
+    # Year patterns
+    r'\s+\(\d{4}\)',
+    r'\s+\d{4}',
+)), re.IGNORECASE)
+
+# Common words dropped from search titles by find_torrent_by_name
+_STOPWORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'})
+
+# Characters that are not allowed in directory names
+_BAD_PATH_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+_MULTISPACE_RE = re.compile(r'\s+')
+
+# Gap allowed between the parts of a mustContain pattern: lazy and confined to one
+# line, so qBittorrent's matcher cannot backtrack across a whole feed entry
+_RULE_GLUE = r'[^\r\n]*?'
+
+def _escape_rule_title(title: str) -> str:
+    """Escape a title for use in a qBittorrent mustContain regex; spaces match any whitespace run."""
+    return re.escape(title).replace('\\ ', '\\s+')
+
+@lru_cache(maxsize=2048)
+def _build_must_contain(title: str, quality: str, year: str = None,
+                        season: str = None, episode: str = None) -> str:
+    """Build the mustContain regex for a movie (year) or TV show (season/episode) rule."""
+    escaped_title = _escape_rule_title(title)
+    glue = _RULE_GLUE
+    if season and episode:
+        # Specific season and episode
+        return f"{escaped_title}{glue}S{season.zfill(2)}E{episode.zfill(2)}{glue}{quality}"
+    if season:
+        # Specific season only
+        return f"{escaped_title}{glue}S{season.zfill(2)}{glue}{quality}"
+    if year:
+        return f"{escaped_title}{glue}{year}{glue}{quality}"
+    return f"{escaped_title}{glue}{quality}"
+
+def _rule_name(rule) -> Optional[str]:
+    """Get the name of a rule as listed by get_auto_download_rules, whatever its shape."""
+    # Try different possible key names for the rule name
+    name = getattr(rule, 'name', None) or getattr(rule, 'ruleName', None)
+    if name is not None:
+        return name
+    if isinstance(rule, dict):
+        return rule.get('name') or rule.get('ruleName')
+    # If it's a string or other type, use it directly
+    return str(rule)
+
+def _find_rule_index(rules_index: List[Tuple[str, str, object]], title_lower: str,
+                     quality_lower: str = None) -> int:
+    """Position of the first rule index entry whose folded name contains the folded title
+    (and quality, if given), or -1."""
+    if quality_lower is None:
+        title_length = len(title_lower)
+        for i, (rule_lower, _, _) in enumerate(rules_index):
+            if len(rule_lower) >= title_length and title_lower in rule_lower:
+                return i
+        return -1
+    # Names shorter than either part cannot contain it (the two may overlap)
+    min_length = max(len(title_lower), len(quality_lower))
+    for i, (rule_lower, _, _) in enumerate(rules_index):
+        if len(rule_lower) >= min_length and title_lower in rule_lower and quality_lower in rule_lower:
+            return i
+    return -1
+
 class QBittorrentClient:
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    @classmethod
+    def get_instance(cls) -> 'QBittorrentClient':
+        """Return the process-wide client, creating it on first use."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+    
     def __init__(self):
-        self.client = qbittorrentapi.Client(
+        self._client = qbittorrentapi.Client(
             host=Settings.QBITTORRENT_HOST,
             port=Settings.QBITTORRENT_PORT,
             username=Settings.QBITTORRENT_USERNAME,
-            password=Settings.QBITTORRENT_PASSWORD
+            password=Settings.QBITTORRENT_PASSWORD,
+            REQUESTS_ARGS={'timeout': QBITTORRENT_TIMEOUT},
+            HTTPADAPTER_ARGS={
+                'pool_connections': 1,  # Single qBittorrent host
+                'pool_maxsize': QBITTORRENT_POOL_SIZE,
+                'pool_block': True
+            }
         )
-        self._connect()
+        # Local mirror of torrent state kept current with sync/maindata diffs
+        self._torrents_lock = threading.Lock()
+        self._rid = 0
+        self._torrents: Dict[str, Dict] = {}
+        self._summaries = ({}, [])  # (mirror the rows were built from, get_all_torrents rows)
+        self._server_state: Dict = {}
+        self._synced_at = 0.0
+        self._feeds_cache = (0.0, None)  # (fetched at, rss_items() result)
+        self._feed_url_cache = (0.0, None)  # (fetched at, first feed URL)
+        # rss_rules() request in progress, shared by callers that arrive meanwhile
+        self._rules_lock = threading.Lock()
+        self._rules_inflight: Optional[Future] = None
+        # Auto-download rules as last fetched, and the same rules keyed by name
+        self._rules_cache = (0.0, None)  # (fetched at, rules)
+        self._rules_by_name: Dict[str, object] = {}
+        self._rules_index: List[Tuple[str, str, object]] = []  # (casefolded name, name, rule) for title lookups
+        self._rules_generation = 0  # Bumped whenever rules change, to drop fetches in flight
+        self._ensured_paths = set()  # Save paths already created on disk
+        self._paths_lock = threading.Lock()
+        self._rss_available: Optional[bool] = None  # RSS API probe result, None until probed
+        # Blocking Web API calls made on behalf of async callers run here, sized to
+        # the connection pool and kept apart from the event loop's default executor
+        self._executor = ThreadPoolExecutor(max_workers=QBITTORRENT_POOL_SIZE,
+                                            thread_name_prefix='qbittorrent')
+        # Logging in is deferred until the first Web API call
+        self._logged_in = False
+        self._login_lock = threading.Lock()
+    
+    @property
+    def client(self) -> qbittorrentapi.Client:
+        """Web API client, logged in on first access."""
+        if not self._logged_in:
+            self._connect()
+        return self._client
     
     def _connect(self):
         """Connect to qBittorrent Web API."""
-        try:
-            self.client.auth_log_in()
-            logger.info("Successfully connected to qBittorrent")
-        except Exception as e:
-            logger.error(f"Failed to connect to qBittorrent: {e}")
-            raise
+        with self._login_lock:
+            if self._logged_in:
+                return
+            try:
+                self._client.auth_log_in()
+                self._logged_in = True
+                logger.info("Successfully connected to qBittorrent")
+            except Exception as e:
+                logger.error(f"Failed to connect to qBittorrent: {e}")
+                raise
     
     def add_magnet_link(self, magnet_link: str, save_path: str, 
                        category: str = None) -> Optional[str]:
@@ -41,8 +238,12 @@ class QBittorrentClient:
             Hash of the added torrent or None if failed
         """
         try:
-            # Create save path if it doesn't exist
-            os.makedirs(save_path, exist_ok=True)
+            # Create save path if it doesn't exist (once per path)
+            if save_path not in self._ensured_paths:
+                with self._paths_lock:
+                    if save_path not in self._ensured_paths:
+                        os.makedirs(save_path, exist_ok=True)
+                        self._ensured_paths.add(save_path)
             
             # Add the torrent
             torrent = self.client.torrents_add(
@@ -51,106 +252,277 @@ class QBittorrentClient:
                 category=category
             )
             
-            logger.info(f"Added torrent with hash: {torrent}")
-            return torrent
+            # qBittorrent answers 'Fails.' when it rejects the link
+            if torrent != 'Ok.':
+                logger.warning(f"qBittorrent did not add the magnet link: {torrent}")
+                return None
+            
+            # qBittorrent adds torrents asynchronously; wait until it lists this one so
+            # callers can look it up straight away
+            match = _BTIH_RE.search(magnet_link)
+            if not match:
+                self.invalidate_torrents_cache()
+                logger.info(f"Added torrent: {torrent}")
+                return torrent
+            torrent_hash = match.group(1).lower()
+            if not self._wait_for_torrent(torrent_hash):
+                logger.warning(f"Torrent {torrent_hash} was accepted but never listed by qBittorrent")
+                return None
+            logger.info(f"Added torrent with hash: {torrent_hash}")
+            return torrent_hash
             
         except Exception as e:
             logger.error(f"Error adding magnet link: {e}")
             return None
     
-    def get_torrent_info(self, torrent_hash: str) -> Optional[Dict]:
-        """Get information about a specific torrent."""
+    def _wait_for_torrent(self, torrent_hash: str) -> bool:
+        """Poll with exponential backoff until a torrent appears in the mirror."""
+        for attempt in range(ADD_POLL_ATTEMPTS):
+            self.invalidate_torrents_cache()
+            if torrent_hash in self._get_torrents_by_hash():
+                return True
+            time.sleep(min(ADD_POLL_BASE_DELAY * 2 ** attempt, ADD_POLL_MAX_DELAY))
+        return False
+    
+    def _sync(self):
+        """
+        Bring the local torrent mirror up to date.
+        
+        Uses the sync/maindata RID protocol, so after the first call qBittorrent only
+        sends torrents that changed. A full_update response (first call, or the server
+        no longer knows our RID) replaces the mirror outright. Skipped while the mirror
+        is younger than TORRENTS_CACHE_TTL. Must be called with the torrents lock held.
+        """
+        now = time.monotonic()
+        if now - self._synced_at < TORRENTS_CACHE_TTL:
+            return
+        
         try:
-            torrents = self.client.torrents_info(hashes=torrent_hash)
-            if torrents:
-                torrent = torrents[0]
-                return {
-                    'hash': torrent.hash,
-                    'name': torrent.name,
-                    'size': torrent.size,
-                    'progress': torrent.progress,
-                    'download_speed': torrent.dlspeed,
-                    'upload_speed': torrent.upspeed,
-                    'state': torrent.state,
-                    'save_path': torrent.save_path,
-                    'category': torrent.category,
-                    'ratio': torrent.ratio,
-                    'eta': torrent.eta,
-                    'num_seeds': torrent.num_seeds,
-                    'num_leechs': torrent.num_leechs
-                }
-            return None
+            data = self.client.sync_maindata(rid=self._rid)
+        except qbittorrentapi.Forbidden403Error:
+            # Session cookie expired; log in again and retry once
+            self._logged_in = False
+            data = self.client.sync_maindata(rid=self._rid)
+        changed = data.get('torrents') or {}
+        removed = data.get('torrents_removed') or []
+        if data.get('full_update'):
+            # A full snapshot does not list removed torrents, so start afresh
+            self._torrents = {
+                torrent_hash: {'hash': torrent_hash, **fields} for torrent_hash, fields in changed.items()
+            }
+            self._server_state = data.get('server_state') or {}
+        else:
+            if changed or removed:
+                # Copy-on-write so callers holding the previous mapping never see it change
+                torrents = dict(self._torrents)
+                for torrent_hash, fields in changed.items():
+                    torrents[torrent_hash] = {**torrents.get(torrent_hash, {'hash': torrent_hash}), **fields}
+                for torrent_hash in removed:
+                    torrents.pop(torrent_hash, None)
+                self._torrents = torrents
+            self._server_state = {**self._server_state, **(data.get('server_state') or {})}
+        self._rid = data.get('rid', 0)
+        self._synced_at = now
+    
+    def _get_torrents_by_hash(self) -> Dict[str, Dict]:
+        """Get all torrents keyed by hash from the synced mirror."""
+        with self._torrents_lock:
+            self._sync()
+            return self._torrents
+    
+    def invalidate_torrents_cache(self):
+        """Force the next lookup to fetch changes after a change to the torrent list."""
+        with self._torrents_lock:
+            self._synced_at = 0.0
+    
+    def get_torrents_info(self, torrent_hashes: List[str]) -> Dict[str, TorrentInfo]:
+        """
+        Get information about several torrents in one lookup.
+        
+        Args:
+            torrent_hashes: Torrent hashes to look up
+        
+        Returns:
+            Mapping of lowercase hash to torrent info for the torrents that exist
+        """
+        try:
+            torrents = self._get_torrents_by_hash()
+            infos = {}
+            for torrent_hash in torrent_hashes:
+                torrent = torrents.get(torrent_hash.lower())
+                if torrent:
+                    infos[torrent['hash']] = TorrentInfo._make(_get_info_fields(torrent))
+            return infos
         except Exception as e:
-            logger.error(f"Error getting torrent info: {e}")
-            return None
+            logger.error(f"Error getting torrents info: {e}")
+            return {}
+    
+    def get_torrent_info(self, torrent_hash: str) -> Optional[TorrentInfo]:
+        """Get information about a specific torrent."""
+        return self.get_torrents_info([torrent_hash]).get(torrent_hash.lower())
+    
+    async def _run_async(self, func, *args, **kwargs):
+        """Run a blocking client method on the qBittorrent executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+    
+    async def get_torrent_info_async(self, torrent_hash: str) -> Optional[TorrentInfo]:
+        """Async version of get_torrent_info that does not block the event loop."""
+        return await self._run_async(self.get_torrent_info, torrent_hash)
+    
+    async def add_magnet_link_async(self, magnet_link: str, save_path: str,
+                                    category: str = None) -> Optional[str]:
+        """Async version of add_magnet_link."""
+        return await self._run_async(self.add_magnet_link, magnet_link, save_path, category)
     
-    def get_all_torrents(self) -> List[Dict]:
-        """Get information about all torrents."""
+    async def get_all_torrents_async(self) -> List[TorrentView]:
+        """Async version of get_all_torrents."""
+        return await self._run_async(self.get_all_torrents)
+    
+    async def get_completed_hashes_async(self) -> Set[str]:
+        """Async version of get_completed_hashes."""
+        return await self._run_async(self.get_completed_hashes)
+    
+    async def is_torrent_completed_async(self, torrent_hash: str) -> bool:
+        """Async version of is_torrent_completed."""
+        return await self._run_async(self.is_torrent_completed, torrent_hash)
+    
+    async def find_torrent_by_name_async(self, search_title: str, content_type: str = None,
+                                         magnet_link: str = None) -> Optional[TorrentView]:
+        """Async version of find_torrent_by_name."""
+        return await self._run_async(self.find_torrent_by_name, search_title, content_type, magnet_link)
+    
+    async def remove_torrent_async(self, torrent_hash: str, delete_files: bool = False):
+        """Async version of remove_torrent."""
+        await self._run_async(self.remove_torrent, torrent_hash, delete_files)
+    
+    async def pause_torrent_async(self, torrent_hash: str):
+        """Async version of pause_torrent."""
+        await self._run_async(self.pause_torrent, torrent_hash)
+    
+    async def resume_torrent_async(self, torrent_hash: str):
+        """Async version of resume_torrent."""
+        await self._run_async(self.resume_torrent, torrent_hash)
+    
+    async def get_download_stats_async(self) -> Dict:
+        """Async version of get_download_stats."""
+        return await self._run_async(self.get_download_stats)
+    
+    async def get_auto_download_rules_async(self) -> List[Dict]:
+        """Async version of get_auto_download_rules."""
+        return await self._run_async(self.get_auto_download_rules)
+    
+    async def rule_exists_by_title_async(self, title: str) -> bool:
+        """Async version of rule_exists_by_title."""
+        return await self._run_async(self.rule_exists_by_title, title)
+    
+    async def get_rule_by_title_async(self, title: str) -> Optional[Dict]:
+        """Async version of get_rule_by_title."""
+        return await self._run_async(self.get_rule_by_title, title)
+    
+    async def rules_matching_titles_async(self, titles: List[str]) -> Dict[str, object]:
+        """Async version of rules_matching_titles."""
+        return await self._run_async(self.rules_matching_titles, titles)
+    
+    async def delete_rule_by_title_async(self, title: str) -> bool:
+        """Async version of delete_rule_by_title."""
+        return await self._run_async(self.delete_rule_by_title, title)
+    
+    def get_all_torrents(self) -> List[TorrentView]:
+        """Get information about all torrents. The list is shared between callers; do not modify it."""
         try:
-            torrents = self.client.torrents_info()
-            return [
-                {
-                    'hash': torrent.hash,
-                    'name': torrent.name,
-                    'size': torrent.size,
-                    'progress': torrent.progress,
-                    'state': torrent.state,
-                    'save_path': torrent.save_path,
-                    'category': torrent.category
-                }
-                for torrent in torrents
-            ]
+            torrents = self._get_torrents_by_hash()
+            # The mirror is replaced rather than modified on change, so rows built
+            # from the same mirror object are still current
+            built_from, summaries = self._summaries
+            if built_from is not torrents:
+                summaries = [TorrentView._make(_get_summary_fields(torrent)) for torrent in torrents.values()]
+                self._summaries = (torrents, summaries)
+            return summaries
         except Exception as e:
             logger.error(f"Error getting all torrents: {e}")
             return []
     
+    def get_completed_hashes(self) -> Set[str]:
+        """Get the hashes of all completed torrents from a single sync."""
+        try:
+            return {
+                torrent_hash for torrent_hash, torrent in self._get_torrents_by_hash().items()
+                if torrent.get('progress') == 1.0
+            }
+        except Exception as e:
+            logger.error(f"Error getting completed torrents: {e}")
+            return set()
+    
     def is_torrent_completed(self, torrent_hash: str) -> bool:
         """Check if a torrent has completed downloading."""
         try:
-            torrent_info = self.get_torrent_info(torrent_hash)
-            if torrent_info:
-                return torrent_info['progress'] == 1.0
-            return False
+            # Read progress straight from the mirror instead of building the full info dict
+            torrent = self._get_torrents_by_hash().get(torrent_hash.lower())
+            return bool(torrent) and torrent.get('progress') == 1.0
         except Exception as e:
             logger.error(f"Error checking torrent completion: {e}")
             return False
     
-    def remove_torrent(self, torrent_hash: str, delete_files: bool = False):
-        """Remove a torrent from qBittorrent."""
+    def remove_torrents(self, torrent_hashes: List[str], delete_files: bool = False):
+        """Remove several torrents from qBittorrent in one request."""
+        if not torrent_hashes:
+            return
         try:
             self.client.torrents_delete(
-                hashes=torrent_hash,
+                hashes='|'.join(torrent_hashes),
                 delete_files=delete_files
             )
-            logger.info(f"Removed torrent: {torrent_hash}")
+            self.invalidate_torrents_cache()
+            logger.info(f"Removed torrents: {torrent_hashes}")
         except Exception as e:
-            logger.error(f"Error removing torrent: {e}")
+            logger.error(f"Error removing torrents: {e}")
+    
+    def remove_torrent(self, torrent_hash: str, delete_files: bool = False):
+        """Remove a torrent from qBittorrent."""
+        self.remove_torrents([torrent_hash], delete_files)
+    
+    def pause_torrents(self, torrent_hashes: List[str]):
+        """Pause several torrents in one request."""
+        if not torrent_hashes:
+            return
+        try:
+            self.client.torrents_pause(hashes='|'.join(torrent_hashes))
+            self.invalidate_torrents_cache()
+            logger.info(f"Paused torrents: {torrent_hashes}")
+        except Exception as e:
+            logger.error(f"Error pausing torrents: {e}")
     
     def pause_torrent(self, torrent_hash: str):
         """Pause a torrent."""
+        self.pause_torrents([torrent_hash])
+    
+    def resume_torrents(self, torrent_hashes: List[str]):
+        """Resume several torrents in one request."""
+        if not torrent_hashes:
+            return
         try:
-            self.client.torrents_pause(hashes=torrent_hash)
-            logger.info(f"Paused torrent: {torrent_hash}")
+            self.client.torrents_resume(hashes='|'.join(torrent_hashes))
+            self.invalidate_torrents_cache()
+            logger.info(f"Resumed torrents: {torrent_hashes}")
         except Exception as e:
-            logger.error(f"Error pausing torrent: {e}")
+            logger.error(f"Error resuming torrents: {e}")
     
     def resume_torrent(self, torrent_hash: str):
         """Resume a torrent."""
-        try:
-            self.client.torrents_resume(hashes=torrent_hash)
-            logger.info(f"Resumed torrent: {torrent_hash}")
-        except Exception as e:
-            logger.error(f"Error resuming torrent: {e}")
+        self.resume_torrents([torrent_hash])
     
     def get_download_stats(self) -> Dict:
         """Get overall download statistics."""
         try:
-            sync_maindata = self.client.sync_maindata()
+            with self._torrents_lock:
+                self._sync()
+                server_state = self._server_state
             return {
-                'total_download_speed': sync_maindata.get('server_state', {}).get('dl_info_speed', 0),
-                'total_upload_speed': sync_maindata.get('server_state', {}).get('up_info_speed', 0),
-                'total_downloaded': sync_maindata.get('server_state', {}).get('dl_info_data', 0),
-                'total_uploaded': sync_maindata.get('server_state', {}).get('up_info_data', 0)
+                'total_download_speed': server_state.get('dl_info_speed', 0),
+                'total_upload_speed': server_state.get('up_info_speed', 0),
+                'total_downloaded': server_state.get('dl_info_data', 0),
+                'total_uploaded': server_state.get('up_info_data', 0)
             }
         except Exception as e:
             logger.error(f"Error getting download stats: {e}")
@@ -188,127 +560,19 @@ class QBittorrentClient:
         Returns:
             Full download path
         """
-        if content_type == 'movie':
-            base_path = Settings.MOVIES_DOWNLOAD_PATH
-            # For movies: Movie Name (Year)
-            if year:
-                folder_name = f"{title} ({year})"
-            else:
-                folder_name = title
-        else:
-            base_path = Settings.TVSHOWS_DOWNLOAD_PATH
-            # For TV shows: Extract just the show name from the torrent title
-            folder_name = self._extract_tv_show_name(title)
-        
-        # Clean title for filesystem compatibility
-        clean_folder_name = self._clean_title_for_path(folder_name)
-        return os.path.join(base_path, clean_folder_name)
+        return _download_path(content_type, title, year)
     
-    def _extract_tv_show_name(self, torrent_title: str) -> str:
-        """
-        Extract the TV show name from a torrent title.
-        
-        Args:
-            torrent_title: Full torrent title (e.g., "Family Guy S01-S20 The Uncensored Collection 1080p...")
-        
-        Returns:
-            Clean TV show name (e.g., "Family Guy")
-        """
-        # First, try to find the show name by looking for common patterns
-        # Look for patterns like "Show Name S01" or "Show Name Season 1"
-        
-        # Pattern 1: Show Name followed by S\d+ (most common)
-        match = re.search(r'^(.+?)\s+S\d+', torrent_title, re.IGNORECASE)
-        if match:
-            show_name = match.group(1).strip()
-            if show_name and len(show_name) > 1:
-                return show_name
-        
-        # Pattern 2: Show Name followed by Season \d+
-        match = re.search(r'^(.+?)\s+Season\s+\d+', torrent_title, re.IGNORECASE)
-        if match:
-            show_name = match.group(1).strip()
-            if show_name and len(show_name) > 1:
-                return show_name
-        
-        # Pattern 3: Show Name followed by S\d+E\d+
-        match = re.search(r'^(.+?)\s+S\d+E\d+', torrent_title, re.IGNORECASE)
-        if match:
-            show_name = match.group(1).strip()
-            if show_name and len(show_name) > 1:
-                return show_name
-        
-        # Pattern 4: Show Name followed by Complete Series
-        match = re.search(r'^(.+?)\s+Complete\s+Series', torrent_title, re.IGNORECASE)
-        if match:
-            show_name = match.group(1).strip()
-            if show_name and len(show_name) > 1:
-                return show_name
-        
-        # Pattern 5: Show Name followed by Collection
-        match = re.search(r'^(.+?)\s+Collection', torrent_title, re.IGNORECASE)
-        if match:
-            show_name = match.group(1).strip()
-            if show_name and len(show_name) > 1:
-                return show_name
-        
-        # If no patterns match, try to extract by removing common suffixes
-        # This is a fallback method
-        cleaned_title = torrent_title
-        
-        # Remove common torrent metadata patterns
-        patterns_to_remove = [
-            # Season patterns
-            r'\s+S\d{1,2}(?:-S?\d{1,2})?',
-            r'\s+Season\s+\d+',
-            r'\s+S\d{1,2}E\d{1,2}',
-            # Quality patterns
-            r'\s+\d{3,4}p',
-            r'\s+4K',
-            r'\s+UHD',
-            # Source patterns
-            r'\s+(?:BluRay|WEBRip|HDTV|DVDRip|BRRip)',
-            # Audio patterns
-            r'\s+(?:DDP\d+|DD\d+Ch|AAC|AC3)',
-            # Video codec patterns
-            r'\s+(?:HEVC|x264|x265|AVC)',
-            # Bit depth patterns
-            r'\s+\d+Bit',
-            # Collection/Complete patterns
-            r'\s+(?:Collection|Complete|Boxset|Box\s*Set|Series)',
-            # Group names (usually at the end with - or .)
-            r'\s*[-.]\s*[A-Za-z0-9]+$',
-            # Additional descriptive text
-            r'\s+(?:The\s+)?(?:Uncensored|Extended|Director\'s\s+Cut|Special\s+Edition)',
-            # Year patterns
-            r'\s+\(\d{4}\)',
-            r'\s+\d{4}',
-        ]
-        
-        for pattern in patterns_to_remove:
-            cleaned_title = re.sub(pattern, '', cleaned_title, flags=re.IGNORECASE)
-        
-        # Clean up any remaining artifacts
-        cleaned_title = re.sub(r'\s+', ' ', cleaned_title)  # Multiple spaces to single space
-        cleaned_title = cleaned_title.strip()
-        
-        # If we end up with an empty string or very short string, fall back to the original title
-        if not cleaned_title or len(cleaned_title) < 2:
-            return torrent_title
-        
-        return cleaned_title
-    
-    def _clean_title_for_path(self, title: str) -> str:
-        """Clean title for use as directory name."""
-        # Remove special characters and replace with spaces
-        clean_title = re.sub(r'[<>:"/\\|?*]', ' ', title)
-        # Replace multiple spaces with single space
-        clean_title = re.sub(r'\s+', ' ', clean_title)
-        # Remove leading/trailing spaces
-        clean_title = clean_title.strip()
-        return clean_title
-    
-    def find_torrent_by_name(self, search_title: str, content_type: str = None, magnet_link: str = None) -> Optional[Dict]:
+    @staticmethod
+    def _extract_tv_show_name(torrent_title: str) -> str:
+        """Extract the TV show name from a torrent title; see the module-level function."""
+        return _extract_tv_show_name(torrent_title)
+    
+    @staticmethod
+    def rule_name(rule) -> Optional[str]:
+        """Get the name of an auto-download rule; see the module-level _rule_name."""
+        return _rule_name(rule)
+    
+    def find_torrent_by_name(self, search_title: str, content_type: str = None, magnet_link: str = None) -> Optional[TorrentView]:
         """
         Find a torrent by name using improved search logic.
         
@@ -318,7 +582,7 @@ class QBittorrentClient:
             magnet_link: Optional magnet link to extract torrent name from
         
         Returns:
-            Torrent info dict if found, None otherwise
+            TorrentView if found, None otherwise
         """
         try:
             all_torrents = self.get_all_torrents()
@@ -345,10 +609,9 @@ class QBittorrentClient:
             search_patterns.append(search_title.replace(' ', '_').lower())
             
             # Remove common words and search
-            common_words = ['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by']
             words = search_title.lower().split()
-            filtered_words = [word for word in words if word not in common_words]
-            if filtered_words:
+            filtered_words = [word for word in words if word not in _STOPWORDS]
+            if filtered_words and filtered_words != words:
                 search_patterns.append(' '.join(filtered_words).lower())
                 search_patterns.append('.'.join(filtered_words).lower())
             
@@ -370,15 +633,13 @@ class QBittorrentClient:
             
             logger.debug(f"Search patterns for '{search_title}': {unique_patterns}")
             
-            # Search through all torrents
+            # Search through all torrents, checking every pattern in one scan of each name
+            patterns_re = re.compile('|'.join(map(re.escape, unique_patterns)))
             for torrent in all_torrents:
-                torrent_name = torrent['name'].lower()
-                
-                # Check each search pattern
-                for pattern in unique_patterns:
-                    if pattern in torrent_name:
-                        logger.info(f"Found torrent '{torrent['name']}' matching pattern '{pattern}' for search '{search_title}'")
-                        return torrent
+                match = patterns_re.search(torrent.name.lower())
+                if match:
+                    logger.info(f"Found torrent '{torrent.name}' matching pattern '{match.group()}' for search '{search_title}'")
+                    return torrent
             
             logger.info(f"No torrent found matching any pattern for '{search_title}'")
             return None
@@ -392,145 +653,164 @@ class QBittorrentClient:
         try:
             # Test getting RSS rules using the API
             rules = self.client.rss_rules()
+            self._rss_available = True
             logger.info(f"[qBittorrent] RSS API is available - found {len(rules)} rules")
             return True
+        except qbittorrentapi.NotFound404Error as e:
+            # The endpoint is missing, so there is no point asking again
+            self._rss_available = False
+            logger.error(f"[qBittorrent] RSS API is not available: {e}")
+            return False
         except Exception as e:
             logger.error(f"[qBittorrent] Error testing RSS API: {e}")
             return False
     
+    def _rss_supported(self) -> bool:
+        """Whether the RSS API is usable, probing it on first use."""
+        if self._rss_available is None:
+            return self.test_rss_api()
+        return self._rss_available
+    
+    def _get_feeds_cached(self):
+        """Get the RSS feed listing, reusing it for FEEDS_CACHE_TTL seconds."""
+        fetched_at, feeds = self._feeds_cache
+        now = time.monotonic()
+        if feeds is None or now - fetched_at >= FEEDS_CACHE_TTL:
+            feeds = self.client.rss_items()
+            self._feeds_cache = (now, feeds)
+        return feeds
+    
     def get_rss_feeds(self) -> List[Dict]:
         """Get RSS feeds to check if any are configured."""
+        if not self._rss_supported():
+            return []
         try:
-            feeds = self.client.rss_items()
+            feeds = self._get_feeds_cached()
             return feeds
         except Exception as e:
             logger.error(f"Error getting RSS feeds: {e}")
             return []
     
+    def _get_first_feed_url(self) -> Optional[str]:
+        """Get the URL of the first RSS feed, reusing it for FEED_URL_CACHE_TTL seconds."""
+        fetched_at, feed_url = self._feed_url_cache
+        now = time.monotonic()
+        if feed_url and now - fetched_at < FEED_URL_CACHE_TTL:
+            return feed_url
+        
+        feeds = self._get_feeds_cached()
+        logger.debug("[RULE_CREATE] Available feeds: %s", feeds)
+        
+        # Find the first available feed URL
+        feed_url = None
+        if isinstance(feeds, dict):
+            for feed_name, feed_data in feeds.items():
+                if hasattr(feed_data, 'url') and feed_data.url:
+                    feed_url = feed_data.url
+                    logger.debug("[RULE_CREATE] Using feed '%s': %s", feed_name, feed_url)
+                    break
+                elif isinstance(feed_data, dict) and feed_data.get('url'):
+                    feed_url = feed_data['url']
+                    logger.debug("[RULE_CREATE] Using feed '%s': %s", feed_name, feed_url)
+                    break
+        
+        if not feed_url:
+            # If no feeds found, try to get feeds using different method
+            try:
+                feed_list = self.client.rss_feeds()
+                if feed_list and len(feed_list) > 0:
+                    first_feed = feed_list[0]
+                    if hasattr(first_feed, 'url'):
+                        feed_url = first_feed.url
+                    elif isinstance(first_feed, dict) and first_feed.get('url'):
+                        feed_url = first_feed['url']
+                    if feed_url:
+                        logger.debug("[RULE_CREATE] Using first feed from rss_feeds(): %s", feed_url)
+            except Exception as e:
+                logger.warning(f"[RULE_CREATE] Could not get feeds from rss_feeds(): {e}")
+        
+        if feed_url:
+            self._feed_url_cache = (now, feed_url)
+        return feed_url
+    
     def create_auto_download_rule(self, rule_name: str, rule_definition: dict) -> bool:
         """Create an auto-download rule in qBittorrent."""
         try:
-            logger.info(f"[RULE_CREATE] Creating rule: '{rule_name}'")
-            logger.info(f"[RULE_CREATE] Rule definition: {rule_definition}")
+            logger.info("[RULE_CREATE] Creating rule: '%s'", rule_name)
+            logger.debug("[RULE_CREATE] Rule definition: %s", rule_definition)
             
-            # Get RSS feeds and assign the rule to the first available feed
+            # Assign the rule to the first available feed
             try:
-                feeds = self.client.rss_items()
-                logger.info(f"[RULE_CREATE] Available feeds: {feeds}")
-                
-                # Find the first available feed URL
-                feed_url = None
-                if isinstance(feeds, dict):
-                    for feed_name, feed_data in feeds.items():
-                        if hasattr(feed_data, 'url') and feed_data.url:
-                            feed_url = feed_data.url
-                            logger.info(f"[RULE_CREATE] Using feed '{feed_name}': {feed_url}")
-                            break
-                        elif isinstance(feed_data, dict) and feed_data.get('url'):
-                            feed_url = feed_data['url']
-                            logger.info(f"[RULE_CREATE] Using feed '{feed_name}': {feed_url}")
-                            break
-                
+                feed_url = self._get_first_feed_url()
                 if feed_url:
                     rule_definition['affectedFeeds'] = [feed_url]
-                    logger.info(f"[RULE_CREATE] Assigned rule to feed: {feed_url}")
+                    logger.debug("[RULE_CREATE] Assigned rule to feed: %s", feed_url)
                 else:
-                    # If no feeds found, try to get feeds using different method
-                    try:
-                        feed_list = self.client.rss_feeds()
-                        if feed_list and len(feed_list) > 0:
-                            first_feed = feed_list[0]
-                            if hasattr(first_feed, 'url'):
-                                feed_url = first_feed.url
-                                rule_definition['affectedFeeds'] = [feed_url]
-                                logger.info(f"[RULE_CREATE] Using first feed from rss_feeds(): {feed_url}")
-                            elif isinstance(first_feed, dict) and first_feed.get('url'):
-                                feed_url = first_feed['url']
-                                rule_definition['affectedFeeds'] = [feed_url]
-                                logger.info(f"[RULE_CREATE] Using first feed from rss_feeds(): {feed_url}")
-                    except Exception as e2:
-                        logger.warning(f"[RULE_CREATE] Could not get feeds from rss_feeds(): {e2}")
-                    
-                    if not feed_url:
-                        logger.warning("[RULE_CREATE] No RSS feeds found, rule may not work properly")
-                        rule_definition['affectedFeeds'] = []
-                        
+                    logger.warning("[RULE_CREATE] No RSS feeds found, rule may not work properly")
+                    rule_definition['affectedFeeds'] = []
             except Exception as e:
                 logger.error(f"Error getting RSS feeds: {e}")
                 rule_definition['affectedFeeds'] = []
             
-            logger.info(f"[RULE_CREATE] Final rule definition: {rule_definition}")
+            logger.debug("[RULE_CREATE] Final rule definition: %s", rule_definition)
+            
+            # Refuse to send a pattern that does not even compile
+            if rule_definition.get('useRegex'):
+                re.compile(rule_definition.get('mustContain', ''))
             
             # Use the qbittorrentapi method
             result = self.client.rss_set_rule(
                 rule_name=rule_name,
                 rule_def=rule_definition
             )
+            self.invalidate_rules_cache()
             
-            logger.info(f"[RULE_CREATE] API response: {result}")
+            logger.debug("[RULE_CREATE] API response: %s", result)
             logger.info(f"Successfully created auto-download rule: {rule_name}")
             return True
         except Exception as e:
             logger.error(f"Error creating auto-download rule: {e}")
             return False
     
-    def create_movie_rule(self, movie_title: str, quality: str = "1080p", save_path: str = None, movie_data: dict = None) -> bool:
-        """Create an auto-download rule for a movie."""
-        if not save_path:
-            save_path = self.get_download_path('movie', movie_title, movie_data.get('year') if movie_data else None)
+    def create_rules_bulk(self, rules: List[Tuple[str, dict]]) -> Dict[str, bool]:
+        """
+        Create many auto-download rules, overlapping the Web API round trips.
         
-        # Create regex pattern for the movie title
-        # Escape special characters and create a flexible pattern
-        escaped_title = movie_title.replace(' ', '\\s+').replace('(', '\\(').replace(')', '\\)')
-        year = None
-        if movie_data:
-            year = movie_data.get('release_date', '')[:4]
-            if not year:
-                year = movie_data.get('year', '')
-        if year and year.isdigit():
-            must_contain = f"{escaped_title}.*{year}.*{quality}"
-        else:
-            must_contain = f"{escaped_title}.*{quality}"
+        Args:
+            rules: (rule_name, rule_definition) pairs
         
-        rule_definition = {
-            "enabled": True,
-            "mustContain": must_contain,
-            "mustNotContain": "",
-            "useRegex": True,
-            "episodeFilter": "",
-            "smartFilter": False,
-            "previouslyMatchedEpisodes": [],
-            "affectedFeeds": [],
-            "ignoreDays": 365,  # Ignore subsequent matches for 365 days
-            "lastMatch": "",
-            "addPaused": False,
-            "assignedCategory": "movies",
-            "savePath": save_path
-        }
+        Returns:
+            Mapping of rule name to whether it was created
+        """
+        if not rules:
+            return {}
         
-        rule_name = f"{movie_title}_{quality}"
-        logger.info(f"[MOVIE_RULE_CREATE] Creating rule with name: '{rule_name}'")
-        logger.info(f"[MOVIE_RULE_CREATE] Movie title: '{movie_title}', Quality: '{quality}', Year: '{year}'")
+        # Look up the feed once instead of letting every worker fetch it
+        try:
+            self._get_first_feed_url()
+        except Exception as e:
+            logger.warning(f"[RULE_CREATE] Could not prefetch RSS feeds: {e}")
         
-        return self.create_auto_download_rule(rule_name, rule_definition)
+        names = [rule_name for rule_name, _ in rules]
+        definitions = [rule_definition for _, rule_definition in rules]
+        with ThreadPoolExecutor(max_workers=min(RULES_BULK_CONCURRENCY, len(rules)),
+                                thread_name_prefix='qbittorrent-rules') as executor:
+            results = executor.map(self.create_auto_download_rule, names, definitions)
+            return dict(zip(names, results))
     
-    def create_upcoming_movie_rule(self, movie_title: str, quality: str = "1080p", save_path: str = None, movie_data: dict = None) -> bool:
-        """Create an auto-download rule for an upcoming movie with ignore subsequent matches for 365 days."""
+    def _create_movie_rule(self, movie_title: str, quality: str, save_path: str, movie_data: dict,
+                           name_suffix: str = "", log_tag: str = "MOVIE_RULE_CREATE") -> bool:
+        """Create an auto-download rule for a movie; shared by the regular and upcoming variants."""
         if not save_path:
             save_path = self.get_download_path('movie', movie_title, movie_data.get('year') if movie_data else None)
         
         # Create regex pattern for the movie title
-        # Escape special characters and create a flexible pattern
-        escaped_title = movie_title.replace(' ', '\\s+').replace('(', '\\(').replace(')', '\\)')
         year = None
         if movie_data:
             year = movie_data.get('release_date', '')[:4]
             if not year:
                 year = movie_data.get('year', '')
-        if year and year.isdigit():
-            must_contain = f"{escaped_title}.*{year}.*{quality}"
-        else:
-            must_contain = f"{escaped_title}.*{quality}"
+        must_contain = _build_must_contain(movie_title, quality, year if year and year.isdigit() else None)
         
         rule_definition = {
             "enabled": True,
@@ -548,32 +828,35 @@ class QBittorrentClient:
             "savePath": save_path
         }
         
-        rule_name = f"{movie_title}_{quality}_Upcoming"
-        logger.info(f"[UPCOMING_MOVIE_RULE_CREATE] Creating upcoming movie rule with name: '{rule_name}'")
-        logger.info(f"[UPCOMING_MOVIE_RULE_CREATE] Movie title: '{movie_title}', Quality: '{quality}', Year: '{year}', IgnoreDays: 365")
+        rule_name = f"{movie_title}_{quality}{name_suffix}"
+        logger.info("[%s] Creating rule with name: '%s'", log_tag, rule_name)
+        logger.debug("[%s] Movie title: '%s', Quality: '%s', Year: '%s', IgnoreDays: 365", log_tag, movie_title, quality, year)
         
         return self.create_auto_download_rule(rule_name, rule_definition)
     
+    def create_movie_rule(self, movie_title: str, quality: str = "1080p", save_path: str = None, movie_data: dict = None) -> bool:
+        """Create an auto-download rule for a movie."""
+        return self._create_movie_rule(movie_title, quality, save_path, movie_data)
+    
+    def create_upcoming_movie_rule(self, movie_title: str, quality: str = "1080p", save_path: str = None, movie_data: dict = None) -> bool:
+        """Create an auto-download rule for an upcoming movie with ignore subsequent matches for 365 days."""
+        return self._create_movie_rule(movie_title, quality, save_path, movie_data,
+                                       name_suffix="_Upcoming", log_tag="UPCOMING_MOVIE_RULE_CREATE")
+    
     def create_tv_show_rule(self, show_title: str, quality: str = "1080p", save_path: str = None, tv_data: dict = None, season: str = None, episode: str = None) -> bool:
         """Create an auto-download rule for a TV show with user-specified season and episode."""
         if not save_path:
             save_path = self.get_download_path('tv', show_title)
         
         # Create regex pattern for the show title
-        escaped_title = show_title.replace(' ', '\\s+').replace('(', '\\(').replace(')', '\\)')
+        must_contain = _build_must_contain(show_title, quality, season=season, episode=episode)
         
-        # Build the must contain pattern
+        # Build the episode filter
         if season and episode:
-            # Specific season and episode
-            must_contain = f"{escaped_title}.*S{season.zfill(2)}E{episode.zfill(2)}.*{quality}"
             episode_filter = f"{season}x{episode.zfill(2)};"
         elif season:
-            # Specific season only
-            must_contain = f"{escaped_title}.*S{season.zfill(2)}.*{quality}"
             episode_filter = f"{season}x01-99;"
         else:
-            # General show pattern
-            must_contain = f"{escaped_title}.*{quality}"
             episode_filter = "1x01-99;"  # Default fallback
         
         rule_definition = {
@@ -598,41 +881,98 @@ class QBittorrentClient:
         if episode:
             rule_name += f"_E{episode}"
         
-        logger.info(f"[TV_RULE_CREATE] Creating rule with name: '{rule_name}'")
-        logger.info(f"[TV_RULE_CREATE] Show title: '{show_title}', Quality: '{quality}', Season: '{season}'")
+        logger.info("[TV_RULE_CREATE] Creating rule with name: '%s'", rule_name)
+        logger.debug("[TV_RULE_CREATE] Show title: '%s', Quality: '%s', Season: '%s'", show_title, quality, season)
         
         return self.create_auto_download_rule(rule_name, rule_definition)
     
-    def get_auto_download_rules(self) -> List[Dict]:
-        """Get all auto-download rules."""
+    def _fetch_rules(self):
+        """Call rss_rules(), coalescing concurrent callers onto one request."""
+        with self._rules_lock:
+            inflight = self._rules_inflight
+            leader = inflight is None
+            if leader:
+                inflight = self._rules_inflight = Future()
+        if not leader:
+            return inflight.result()
+        
         try:
-            logger.info("[RSS_RULES] Fetching RSS rules from qBittorrent...")
             rules = self.client.rss_rules()
-            logger.info(f"[RSS_RULES] Raw response type: {type(rules)}")
-            logger.info(f"[RSS_RULES] Raw response: {rules}")
+            inflight.set_result(rules)
+            return rules
+        except BaseException as e:
+            inflight.set_exception(e)
+            raise
+        finally:
+            with self._rules_lock:
+                self._rules_inflight = None
+    
+    def _load_rules(self) -> List:
+        """Fetch the auto-download rules from qBittorrent as a list."""
+        logger.debug("[RSS_RULES] Fetching RSS rules from qBittorrent...")
+        rules = self._fetch_rules()
+        logger.debug("[RSS_RULES] Raw response (%s): %s", type(rules), rules)
+        
+        if rules:
+            logger.debug("[RSS_RULES] Successfully retrieved %d rules", len(rules))
             
-            if rules:
-                logger.info(f"[RSS_RULES] Successfully retrieved {len(rules)} rules")
-                
-                # Ensure we return a list that can be sliced
-                if isinstance(rules, (list, tuple)):
-                    return list(rules)  # Convert to list to ensure it's sliceable
-                elif hasattr(rules, '__iter__'):
-                    # If it's an iterable but not a list/tuple, convert it
-                    try:
-                        rules_list = list(rules)
-                        logger.info(f"[RSS_RULES] Converted iterable to list with {len(rules_list)} items")
-                        return rules_list
-                    except Exception as convert_error:
-                        logger.warning(f"[RSS_RULES] Could not convert rules to list: {convert_error}")
-                        return [rules] if rules else []
-                else:
-                    # If it's a single object, wrap it in a list
-                    logger.info("[RSS_RULES] Rules is a single object, wrapping in list")
+            # Ensure we return a list that can be sliced
+            if isinstance(rules, (list, tuple)):
+                return list(rules)  # Convert to list to ensure it's sliceable
+            elif hasattr(rules, '__iter__'):
+                # If it's an iterable but not a list/tuple, convert it
+                try:
+                    rules_list = list(rules)
+                    logger.debug("[RSS_RULES] Converted iterable to list with %d items", len(rules_list))
+                    return rules_list
+                except Exception as convert_error:
+                    logger.warning(f"[RSS_RULES] Could not convert rules to list: {convert_error}")
                     return [rules] if rules else []
             else:
-                logger.info("[RSS_RULES] No rules found or empty response")
-                return []
+                # If it's a single object, wrap it in a list
+                logger.debug("[RSS_RULES] Rules is a single object, wrapping in list")
+                return [rules] if rules else []
+        else:
+            logger.debug("[RSS_RULES] No rules found or empty response")
+            return []
+    
+    def _get_rules_cached(self) -> List:
+        """
+        Get the auto-download rules, reusing them for RULES_CACHE_TTL seconds.
+        
+        Also refreshes _rules_by_name. Raises if the rules cannot be fetched.
+        """
+        fetched_at, rules = self._rules_cache
+        now = time.monotonic()
+        if rules is not None and now - fetched_at < RULES_CACHE_TTL:
+            return rules
+        
+        generation = self._rules_generation
+        rules = self._load_rules()
+        rules_by_name = {}
+        rules_index = []
+        for rule in rules:
+            rule_name = _rule_name(rule)
+            rules_by_name.setdefault(rule_name, rule)
+            if rule_name:
+                rules_index.append((rule_name.casefold(), rule_name, rule))
+        self._rules_by_name = rules_by_name
+        self._rules_index = rules_index
+        # A rule created or deleted during the fetch may be missing from it; use it
+        # this once but do not keep it
+        if generation == self._rules_generation:
+            self._rules_cache = (now, rules)
+        return rules
+    
+    def invalidate_rules_cache(self):
+        """Force the next rule lookup to fetch the rules after creating or deleting one."""
+        self._rules_generation += 1
+        self._rules_cache = (0.0, None)
+    
+    def get_auto_download_rules(self) -> List[Dict]:
+        """Get all auto-download rules."""
+        try:
+            return self._get_rules_cached()
         except Exception as e:
             logger.error(f"Error getting auto-download rules: {e}")
             return []
@@ -641,6 +981,7 @@ class QBittorrentClient:
         """Delete an auto-download rule."""
         try:
             self.client.rss_remove_rule(rule_name=rule_name)
+            self.invalidate_rules_cache()
             logger.info(f"Successfully deleted auto-download rule: {rule_name}")
             return True
         except Exception as e:
@@ -650,45 +991,10 @@ class QBittorrentClient:
     def rule_exists(self, rule_name: str) -> bool:
         """Check if a rule already exists by exact rule name."""
         try:
-            rules = self.get_auto_download_rules()
-            
-            # Debug logging - print all rule names and structure
-            logger.info(f"[RULE_CHECK] Looking for rule: '{rule_name}'")
-            logger.info(f"[RULE_CHECK] Found {len(rules)} total rules")
-            
-            if not rules:
-                logger.info("[RULE_CHECK] No rules found")
-                return False
-            
-            # Log the first rule structure to understand the API response format
-            if rules:
-                first_rule = rules[0]
-                logger.info(f"[RULE_CHECK] First rule structure: {first_rule}")
-                logger.info(f"[RULE_CHECK] First rule keys: {list(first_rule.keys()) if hasattr(first_rule, 'keys') else 'No keys attribute'}")
-            
-            # Check each rule - try different possible key names
-            for i, rule in enumerate(rules):
-                # Try different possible key names for the rule name
-                rule_name_value = None
-                if hasattr(rule, 'name'):
-                    rule_name_value = rule.name
-                elif hasattr(rule, 'ruleName'):
-                    rule_name_value = rule.ruleName
-                elif isinstance(rule, dict):
-                    rule_name_value = rule.get('name') or rule.get('ruleName')
-                else:
-                    # If it's a string or other type, use it directly
-                    rule_name_value = str(rule)
-                
-                logger.info(f"[RULE_CHECK] Rule {i}: '{rule_name_value}' (type: {type(rule)})")
-                
-                if rule_name_value == rule_name:
-                    logger.info(f"[RULE_CHECK] ✅ Found matching rule: '{rule_name}'")
-                    return True
-            
-            logger.info(f"[RULE_CHECK] ❌ No matching rule found for: '{rule_name}'")
-            return False
-            
+            self._get_rules_cached()
+            exists = rule_name in self._rules_by_name
+            logger.debug("[RULE_CHECK] Rule '%s' exists: %s", rule_name, exists)
+            return exists
         except Exception as e:
             logger.error(f"Error checking if rule exists: {e}")
             return False
@@ -696,40 +1002,20 @@ class QBittorrentClient:
     def rule_exists_by_title_and_quality(self, title: str, quality: str) -> bool:
         """Check if a rule already exists for a specific title and quality combination."""
         try:
-            rules = self.get_auto_download_rules()
+            self._get_rules_cached()
+            rules_index = self._rules_index
             
-            logger.info(f"[RULE_CHECK_TITLE] Looking for rule with title: '{title}' and quality: '{quality}'")
-            logger.info(f"[RULE_CHECK_TITLE] Found {len(rules)} total rules")
+            logger.info("[RULE_CHECK_TITLE] Looking for rule with title: '%s' and quality: '%s'", title, quality)
+            logger.info("[RULE_CHECK_TITLE] Found %s total rules", len(rules_index))
             
-            if not rules:
-                logger.info("[RULE_CHECK_TITLE] No rules found")
-                return False
+            # Check each rule name for title and quality match
+            # Rule names follow pattern: Title_Quality or Title_Quality_S01
+            i = _find_rule_index(rules_index, title.casefold(), quality.casefold())
+            if i != -1:
+                logger.info("[RULE_CHECK_TITLE] ✅ Found existing rule: '%s' for '%s' with quality '%s'", rules_index[i][1], title, quality)
+                return True
             
-            # Check each rule for title and quality match
-            for i, rule in enumerate(rules):
-                rule_name_value = None
-                if hasattr(rule, 'name'):
-                    rule_name_value = rule.name
-                elif hasattr(rule, 'ruleName'):
-                    rule_name_value = rule.ruleName
-                elif isinstance(rule, dict):
-                    rule_name_value = rule.get('name') or rule.get('ruleName')
-                else:
-                    rule_name_value = str(rule)
-                
-                if rule_name_value:
-                    # Check if rule name contains the title and quality
-                    # Rule names follow pattern: Auto_Title_Quality or Auto_Title_Quality_S01
-                    rule_lower = rule_name_value.lower()
-                    title_lower = title.lower()
-                    quality_lower = quality.lower()
-                    
-                    # Check if rule contains both title and quality
-                    if title_lower in rule_lower and quality_lower in rule_lower:
-                        logger.info(f"[RULE_CHECK_TITLE] ✅ Found existing rule: '{rule_name_value}' for '{title}' with quality '{quality}'")
-                        return True
-            
-            logger.info(f"[RULE_CHECK_TITLE] ❌ No existing rule found for '{title}' with quality '{quality}'")
+            logger.info("[RULE_CHECK_TITLE] ❌ No existing rule found for '%s' with quality '%s'", title, quality)
             return False
             
         except Exception as e:
@@ -739,38 +1025,19 @@ class QBittorrentClient:
     def rule_exists_by_title(self, title: str) -> bool:
         """Check if ANY rule exists for a specific title (regardless of quality or season)."""
         try:
-            rules = self.get_auto_download_rules()
+            self._get_rules_cached()
+            rules_index = self._rules_index
             
-            logger.info(f"[RULE_CHECK_TITLE_ONLY] Looking for ANY rule with title: '{title}'")
-            logger.info(f"[RULE_CHECK_TITLE_ONLY] Found {len(rules)} total rules")
-            
-            if not rules:
-                logger.info("[RULE_CHECK_TITLE_ONLY] No rules found")
-                return False
+            logger.info("[RULE_CHECK_TITLE_ONLY] Looking for ANY rule with title: '%s'", title)
+            logger.info("[RULE_CHECK_TITLE_ONLY] Found %s total rules", len(rules_index))
             
-            # Check each rule for title match
-            for i, rule in enumerate(rules):
-                rule_name_value = None
-                if hasattr(rule, 'name'):
-                    rule_name_value = rule.name
-                elif hasattr(rule, 'ruleName'):
-                    rule_name_value = rule.ruleName
-                elif isinstance(rule, dict):
-                    rule_name_value = rule.get('name') or rule.get('ruleName')
-                else:
-                    rule_name_value = str(rule)
-                
-                if rule_name_value:
-                    # Check if rule name contains the title
-                    rule_lower = rule_name_value.lower()
-                    title_lower = title.lower()
-                    
-                    # Check if rule contains the title
-                    if title_lower in rule_lower:
-                        logger.info(f"[RULE_CHECK_TITLE_ONLY] ✅ Found existing rule: '{rule_name_value}' for '{title}'")
-                        return True
+            # Check each rule name for title match
+            i = _find_rule_index(rules_index, title.casefold())
+            if i != -1:
+                logger.info("[RULE_CHECK_TITLE_ONLY] ✅ Found existing rule: '%s' for '%s'", rules_index[i][1], title)
+                return True
             
-            logger.info(f"[RULE_CHECK_TITLE_ONLY] ❌ No existing rule found for '{title}'")
+            logger.info("[RULE_CHECK_TITLE_ONLY] ❌ No existing rule found for '%s'", title)
             return False
             
         except Exception as e:
@@ -780,32 +1047,15 @@ class QBittorrentClient:
     def get_rule_by_title(self, title: str) -> Optional[Dict]:
         """Get rule details for a specific title."""
         try:
-            rules = self.get_auto_download_rules()
+            self._get_rules_cached()
+            rules_index = self._rules_index
             
-            if not rules:
-                return None
-            
-            # Check each rule for title match
-            for rule in rules:
-                rule_name_value = None
-                if hasattr(rule, 'name'):
-                    rule_name_value = rule.name
-                elif hasattr(rule, 'ruleName'):
-                    rule_name_value = rule.ruleName
-                elif isinstance(rule, dict):
-                    rule_name_value = rule.get('name') or rule.get('ruleName')
-                else:
-                    rule_name_value = str(rule)
-                
-                if rule_name_value:
-                    # Check if rule name contains the title
-                    rule_lower = rule_name_value.lower()
-                    title_lower = title.lower()
-                    
-                    # Check if rule contains the title
-                    if title_lower in rule_lower:
-                        logger.info(f"[GET_RULE_BY_TITLE] Found rule: '{rule_name_value}' for '{title}'")
-                        return rule
+            # Check each rule name for title match
+            i = _find_rule_index(rules_index, title.casefold())
+            if i != -1:
+                _, rule_name, rule = rules_index[i]
+                logger.info("[GET_RULE_BY_TITLE] Found rule: '%s' for '%s'", rule_name, title)
+                return rule
             
             return None
             
@@ -813,24 +1063,61 @@ class QBittorrentClient:
             logger.error(f"Error getting rule by title: {e}")
             return None
     
+    def rules_matching_titles(self, titles: List[str]) -> Dict[str, object]:
+        """
+        Find the first rule matching each of several titles in one pass over the rules.
+        
+        Args:
+            titles: Titles to look up, matched like get_rule_by_title
+        
+        Returns:
+            Mapping of title to its first matching rule; titles without a rule are left out
+        """
+        try:
+            titles = list(dict.fromkeys(titles))
+            if len(titles) <= 1:
+                matches = {}
+                for title in titles:
+                    rule = self.get_rule_by_title(title)
+                    if rule is not None:
+                        matches[title] = rule
+                return matches
+            
+            self._get_rules_cached()
+            
+            # One pass with an alternation of every title skips the rules that
+            # match none of them; only the rest are checked title by title
+            pending = {title: title.casefold() for title in titles}
+            any_title = re.compile('|'.join(re.escape(folded) for folded in set(pending.values())))
+            matches = {}
+            for rule_lower, _, rule in self._rules_index:
+                if not any_title.search(rule_lower):
+                    continue
+                for title, title_lower in list(pending.items()):
+                    if title_lower in rule_lower:
+                        matches[title] = rule
+                        del pending[title]
+                if not pending:
+                    break
+            
+            logger.info("[RULES_MATCHING_TITLES] %s/%s titles have a rule", len(matches), len(titles))
+            return matches
+            
+        except Exception as e:
+            logger.error(f"Error matching rules to titles: {e}")
+            return {}
+    
     def delete_rule_by_title(self, title: str) -> bool:
         """Delete rule for a specific title."""
         try:
-            rule = self.get_rule_by_title(title)
-            if rule:
-                rule_name = None
-                if hasattr(rule, 'name'):
-                    rule_name = rule.name
-                elif hasattr(rule, 'ruleName'):
-                    rule_name = rule.ruleName
-                elif isinstance(rule, dict):
-                    rule_name = rule.get('name') or rule.get('ruleName')
-                else:
-                    rule_name = str(rule)
-                
-                if rule_name:
-                    logger.info(f"[DELETE_RULE_BY_TITLE] Deleting rule: '{rule_name}' for '{title}'")
-                    return self.delete_auto_download_rule(rule_name)
+            self._get_rules_cached()
+            rules_index = self._rules_index
+            
+            i = _find_rule_index(rules_index, title.casefold())
+            if i != -1:
+                rule_name = rules_index[i][1]
+                logger.info("[DELETE_RULE_BY_TITLE] Deleting rule: '%s' for '%s'", rule_name, title)
+                return self.delete_auto_download_rule(rule_name)
             
             return False
             
@@ -840,6 +1127,9 @@ class QBittorrentClient:
 
     def test_rss_feeds_working(self) -> bool:
         """Test if RSS feeds are working and have content."""
+        if not self._rss_supported():
+            logger.warning("[qBittorrent] RSS API is not available")
+            return False
         try:
             logger.info("[qBittorrent] Testing RSS feeds...")
             
@@ -850,7 +1140,7 @@ class QBittorrentClient:
             # Method 1: Try rss_items()
             try:
                 items = self.client.rss_items()
-                logger.info(f"[qBittorrent] rss_items() returned: {type(items)} - {items}")
+                logger.debug("[qBittorrent] rss_items() returned: %s - %s", type(items), items)
             except Exception as e:
                 logger.warning(f"[qBittorrent] rss_items() failed: {e}")
             
@@ -867,12 +1157,15 @@ class QBittorrentClient:
             total_items = 0
             if items:
                 if isinstance(items, dict):
+                    log_feeds = logger.isEnabledFor(logging.INFO)
                     for feed_name, feed_items in items.items():
                         if isinstance(feed_items, list):
-                            total_items += len(feed_items)
-                            logger.info(f"[qBittorrent] Feed '{feed_name}' has {len(feed_items)} items")
+                            count = len(feed_items)
+                            total_items += count
+                            if log_feeds:
+                                logger.info("[qBittorrent] Feed '%s' has %s items", feed_name, count)
                         else:
-                            logger.warning(f"[qBittorrent] Feed '{feed_name}' has no items")
+                            logger.warning("[qBittorrent] Feed '%s' has no items", feed_name)
                 else:
                     total_items = len(items)
                     logger.info(f"[qBittorrent] Found {total_items} RSS items")
@@ -905,6 +1198,10 @@ class QBittorrentClient:
             # Try multiple refresh methods
             try:
                 self.client.rss_refresh_item()
+                self._feeds_cache = (0.0, None)
+                self._feed_url_cache = (0.0, None)
+                # The RSS API answered, so forget an earlier failed probe
+                self._rss_available = True
                 logger.info("[qBittorrent] rss_refresh_item() successful")
             except Exception as e:
                 logger.warning(f"[qBittorrent] rss_refresh_item() failed: {e}")
@@ -925,21 +1222,8 @@ class QBittorrentClient:
             logger.info(f"[RULE_TEST] Testing rule functionality for: '{rule_name}'")
             
             # Get the rule details
-            rules = self.get_auto_download_rules()
-            target_rule = None
-            
-            for rule in rules:
-                rule_name_value = None
-                if hasattr(rule, 'name'):
-                    rule_name_value = rule.name
-                elif hasattr(rule, 'ruleName'):
-                    rule_name_value = rule.ruleName
-                elif isinstance(rule, dict):
-                    rule_name_value = rule.get('name') or rule.get('ruleName')
-                
-                if rule_name_value == rule_name:
-                    target_rule = rule
-                    break
+            self._get_rules_cached()
+            target_rule = self._rules_by_name.get(rule_name)
             
             if not target_rule:
                 logger.error(f"[RULE_TEST] Rule '{rule_name}' not found")
@@ -974,4 +1258,72 @@ class QBittorrentClient:
             
         except Exception as e:
             logger.error(f"[RULE_TEST] Error testing rule functionality: {e}")
-            return False 
\ No newline at end of file
+            return False 
+
+
+@lru_cache(maxsize=2048)
+def _extract_tv_show_name(torrent_title: str) -> str:
+    """
+    Extract the TV show name from a torrent title.
+    
+    Args:
+        torrent_title: Full torrent title (e.g., "Family Guy S01-S20 The Uncensored Collection 1080p...")
+    
+    Returns:
+        Clean TV show name (e.g., "Family Guy")
+    """
+    # First, try to find the show name by looking for common patterns
+    # Look for patterns like "Show Name S01" or "Show Name Season 1"
+    for pattern in _TV_NAME_PATTERNS:
+        match = pattern.search(torrent_title)
+        if match:
+            show_name = match.group(1).strip()
+            if show_name and len(show_name) > 1:
+                return show_name
+    
+    # If no patterns match, try to extract by removing common suffixes
+    # This is a fallback method
+    cleaned_title = _TV_METADATA_RE.sub('', torrent_title)
+    cleaned_title = _TV_GROUP_SUFFIX_RE.sub('', cleaned_title)
+    cleaned_title = _TV_TRAILING_METADATA_RE.sub('', cleaned_title)
+    
+    # Clean up any remaining artifacts
+    cleaned_title = _MULTISPACE_RE.sub(' ', cleaned_title)  # Multiple spaces to single space
+    cleaned_title = cleaned_title.strip()
+    
+    # If we end up with an empty string or very short string, fall back to the original title
+    if not cleaned_title or len(cleaned_title) < 2:
+        return torrent_title
+    
+    return cleaned_title
+
+
+@lru_cache(maxsize=1024)
+def _clean_title_for_path(title: str) -> str:
+    """Clean title for use as directory name."""
+    # Remove special characters and replace with spaces
+    clean_title = _BAD_PATH_CHARS_RE.sub(' ', title)
+    # Replace multiple spaces with single space
+    clean_title = _MULTISPACE_RE.sub(' ', clean_title)
+    # Remove leading/trailing spaces
+    return clean_title.strip()
+
+
+@lru_cache(maxsize=1024)
+def _download_path(content_type: str, title: str, year: Optional[str]) -> str:
+    """Build the download path for a title; see QBittorrentClient.get_download_path."""
+    if content_type == 'movie':
+        base_path = Settings.MOVIES_DOWNLOAD_PATH
+        # For movies: Movie Name (Year)
+        if year:
+            folder_name = f"{title} ({year})"
+        else:
+            folder_name = title
+    else:
+        base_path = Settings.TVSHOWS_DOWNLOAD_PATH
+        # For TV shows: Extract just the show name from the torrent title
+        folder_name = _extract_tv_show_name(title)
+    
+    # Clean title for filesystem compatibility
+    clean_folder_name = _clean_title_for_path(folder_name)
+    return os.path.join(base_path, clean_folder_name)
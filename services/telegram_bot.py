@@ -6,7 +6,7 @@ from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQu
 from typing import Dict, List, Optional
 import json
 
-from config.settings import Settings
+from config.settings import get_settings
 from services.prowlarr_client import ProwlarrClient
 from services.qbittorrent_client import QBittorrentClient
 from services.tmdb_client import TMDBClient
@@ -16,14 +16,19 @@ logger = logging.getLogger(__name__)
 
 class TelegramBot:
     def __init__(self):
-        self.settings = Settings()
-        self.prowlarr_client = ProwlarrClient()
-        self.qbittorrent_client = QBittorrentClient()
+        self.settings = get_settings()
+        self.qbittorrent_client = QBittorrentClient.get_instance()
+        self.prowlarr_client = ProwlarrClient(self.qbittorrent_client)
         self.tmdb_client = TMDBClient()
         self.database = Database()
+        # Completed-download checker interval, backed off while nothing is downloading
+        self._check_interval = self.settings.CHECK_INTERVAL
+        # Wakes the checker from its wait; it belongs to the checker thread's event loop
+        self._checker_loop = None
+        self._check_wakeup = None
         
         # Log authorized users on startup
-        logger.info(f"Bot initialized with {len(self.settings.AUTHORIZED_USERS)} authorized users: {self.settings.AUTHORIZED_USERS}")
+        logger.info(f"Bot initialized with {len(self.settings.AUTHORIZED_USERS)} authorized users: {sorted(self.settings.AUTHORIZED_USERS)}")
         
         # Initialize bot application
         self.application = Application.builder().token(self.settings.TELEGRAM_BOT_TOKEN).build()
@@ -55,14 +60,14 @@ class TelegramBot:
         logger.info(f"[START] User {user_id} (@{username}, {first_name}) requested /start command")
         
         if not self._is_authorized_user(user_id):
-            logger.warning(f"[AUTH] User {user_id} (@{username}) is NOT authorized. Authorized users: {self.settings.AUTHORIZED_USERS}")
+            logger.warning(f"[AUTH] User {user_id} (@{username}) is NOT authorized. Authorized users: {sorted(self.settings.AUTHORIZED_USERS)}")
             await update.message.reply_text("❌ You are not authorized to use this bot.")
             return
         
         logger.info(f"[AUTH] User {user_id} (@{username}) is authorized")
         
         # Create or update user session
-        self.database.create_user_session(user_id, 'idle')
+        await asyncio.to_thread(self.database.create_user_session, user_id, 'idle')
         
         keyboard = [
             [InlineKeyboardButton("🎬 Search Movies", callback_data="search_movies")],
@@ -164,6 +169,7 @@ class TelegramBot:
         logger.info(f"[DEBUG] User {user_id} (@{username}) requested /debug command")
         
         # Always allow debug command for troubleshooting
+        user_session = await asyncio.to_thread(self.database.get_user_session, user_id)
         debug_info = f"""
 🔍 **Debug Information**
 
@@ -174,7 +180,7 @@ class TelegramBot:
 
 🔐 **Authorization:**
 • Is Authorized: {'✅ Yes' if self._is_authorized_user(user_id) else '❌ No'}
-• Authorized Users: `{self.settings.AUTHORIZED_USERS}`
+• Authorized Users: `{sorted(self.settings.AUTHORIZED_USERS)}`
 • Total Authorized: {len(self.settings.AUTHORIZED_USERS)}
 
 ⚙️ **Bot Configuration:**
@@ -183,7 +189,7 @@ class TelegramBot:
 • TMDB API: {'✅ Set' if self.settings.TMDB_API_KEY else '❌ Missing'}
 
 📊 **Session Data:**
-• User Session: {'✅ Active' if self.database.get_user_session(user_id) else '❌ None'}
+• User Session: {'✅ Active' if user_session else '❌ None'}
 • Context Data Keys: {list(context.user_data.keys()) if context.user_data else 'None'}
         """
         
@@ -201,11 +207,11 @@ class TelegramBot:
             return
         
         # Get count of old downloads before cleanup
-        old_downloads = self.database.get_all_downloads_older_than(24)
+        old_downloads = await asyncio.to_thread(self.database.get_all_downloads_older_than, 24)
         old_count = len(old_downloads)
         
         # Perform cleanup
-        deleted_count = self.database.cleanup_old_downloads(hours=24)
+        deleted_count = await asyncio.to_thread(self.database.cleanup_old_downloads, hours=24)
         
         cleanup_info = f"""
 🧹 **Database Cleanup Completed!**
@@ -250,7 +256,7 @@ class TelegramBot:
             await self._handle_season_input(update, context)
             return
         
-        user_session = self.database.get_user_session(user_id)
+        user_session = await asyncio.to_thread(self.database.get_user_session, user_id)
         if not user_session:
             logger.info(f"[SESSION] User {user_id} (@{username}) has no active session, redirecting to /start")
             await update.message.reply_text("Please use /start to begin.")
@@ -322,7 +328,7 @@ class TelegramBot:
         context.user_data['search_type'] = search_type
         
         # Update user session to waiting for search query
-        self.database.update_user_session(user_id, 'waiting_for_search_query')
+        await asyncio.to_thread(self.database.update_user_session, user_id, 'waiting_for_search_query')
         
         prompt = {
             'movies': 'movie',
@@ -337,7 +343,6 @@ class TelegramBot:
     async def _handle_search_query(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         user_id = update.effective_user.id
         username = update.effective_user.username or "Unknown"
-        user_session = self.database.get_user_session(user_id)
         search_type = context.user_data.get('search_type', 'movies')
         query_text = update.message.text
         
@@ -444,14 +449,21 @@ class TelegramBot:
                 keyboard = []
                 shows_in_production = []
                 
-                for i, tv_show in enumerate(results[:10]):  # Check more results to find production shows
+                candidates = results[:10]  # Check more results to find production shows
+                # Fetch details for all candidates concurrently instead of one round trip at a time
+                details_by_id = await asyncio.to_thread(
+                    self.tmdb_client.get_tv_show_details_many,
+                    [tv_show.get('id') for tv_show in candidates if tv_show.get('id')]
+                )
+                
+                for i, tv_show in enumerate(candidates):
                     name = tv_show.get('name', 'Unknown')
                     first_air_date = tv_show.get('first_air_date', 'Unknown')
                     tv_id = tv_show.get('id')
                     
                     # Get detailed info to check if in production
                     if tv_id:
-                        detailed = self.tmdb_client.get_tv_show_details(tv_id)
+                        detailed = details_by_id.get(tv_id)
                         if detailed:
                             is_in_production = self.tmdb_client.is_show_in_production(detailed)
                             last_season_info = self.tmdb_client.get_last_season_info(detailed)
@@ -660,7 +672,7 @@ class TelegramBot:
             year=year
         )
         # Add to qBittorrent
-        torrent_hash = self.qbittorrent_client.add_magnet_link(
+        torrent_hash = await self.qbittorrent_client.add_magnet_link_async(
             magnet_link, 
             download_path,
             category=search_type
@@ -668,7 +680,8 @@ class TelegramBot:
         if not torrent_hash:
             await query.edit_message_text("❌ Failed to add torrent to qBittorrent.")
             return
-        download_id = self.database.add_download(
+        download_id = await asyncio.to_thread(
+            self.database.add_download,
             query.from_user.id,
             torrent['name'],
             torrent['id'],
@@ -677,6 +690,8 @@ class TelegramBot:
         )
         if context is not None:
             context.user_data[f'torrent_{download_id}'] = torrent_hash
+        # Watch the new download at the normal pace again
+        self._reset_check_interval()
         await query.edit_message_text(
             f"✅ **Download Started!**\n\n"
             f"📁 **Title:** {torrent['name']}\n"
@@ -691,8 +706,8 @@ class TelegramBot:
         user_id = update.effective_user.id if hasattr(update, 'effective_user') else update.from_user.id
         
         # Get downloads from last 24 hours and statistics
-        downloads = self.database.get_user_downloads(user_id, hours=24)
-        stats = self.database.get_download_statistics(user_id, hours=24)
+        downloads = await asyncio.to_thread(self.database.get_user_downloads, user_id, hours=24)
+        stats = await asyncio.to_thread(self.database.get_download_statistics, user_id, hours=24)
         
         if not downloads:
             text = "📥 **Your Downloads (Last 24 Hours)**\n\n"
@@ -710,10 +725,10 @@ class TelegramBot:
             text += "📋 **Recent Downloads:**\n\n"
             
             for download in downloads[:10]:  # Show last 10 downloads
-                status_emoji = "✅" if download[3] == 'completed' else "⏳"
-                text += f"{status_emoji} **{download[1]}**\n"
-                text += f"📊 Status: {download[3]}\n"
-                text += f"📅 Added: {download[4]}\n\n"
+                status_emoji = "✅" if download['status'] == 'completed' else "⏳"
+                text += f"{status_emoji} **{download['title']}**\n"
+                text += f"📊 Status: {download['status']}\n"
+                text += f"📅 Added: {download['created_at']}\n\n"
         
         keyboard = [[InlineKeyboardButton("🔙 Back to Main Menu", callback_data="back_to_main")]]
         reply_markup = InlineKeyboardMarkup(keyboard)
@@ -745,7 +760,7 @@ class TelegramBot:
     def _is_authorized_user(self, user_id: int) -> bool:
         """Check if user is authorized."""
         is_authorized = user_id in self.settings.AUTHORIZED_USERS
-        logger.debug(f"[AUTH_CHECK] User {user_id} authorization: {is_authorized} (Authorized users: {self.settings.AUTHORIZED_USERS})")
+        logger.debug("[AUTH_CHECK] User %s authorization: %s (Authorized users: %s)", user_id, is_authorized, self.settings.AUTHORIZED_USERS)
         return is_authorized
     
     def _format_speed(self, speed_bytes: int) -> str:
@@ -761,23 +776,33 @@ class TelegramBot:
         
         return f"{speed_bytes:.1f} {size_names[i]}"
     
+    def _reset_check_interval(self):
+        """Check at the normal pace again, cutting short a backed-off wait in progress."""
+        self._check_interval = self.settings.CHECK_INTERVAL
+        if self._check_wakeup is not None:
+            # The checker runs its own event loop in another thread
+            self._checker_loop.call_soon_threadsafe(self._check_wakeup.set)
+    
     async def check_completed_downloads(self):
         """Check for completed downloads and notify users."""
         import time
+        self._checker_loop = asyncio.get_running_loop()
+        self._check_wakeup = asyncio.Event()
         while True:
             try:
                 logger.info("[Checker] Checking for completed downloads...")
                 # Get all downloads from database (last 24 hours only)
                 all_downloads = []
                 for user_id in self.settings.AUTHORIZED_USERS:
-                    downloads = self.database.get_user_downloads(user_id, hours=24)
+                    downloads = await asyncio.to_thread(self.database.get_user_downloads, user_id, hours=24)
                     all_downloads.extend([(user_id, download) for download in downloads])
-                # Check each download
+                # Resolve torrent hashes first so completion is checked in one batch
+                pending = []
                 for user_id, download in all_downloads:
-                    download_id = download[0]
-                    title = download[1]
-                    torrent_id = download[2]
-                    status = download[3]
+                    download_id = download['id']
+                    title = download['title']
+                    torrent_id = download['torrent_id']
+                    status = download['status']
                     # Get the torrent hash from user_data if available
                     torrent_hash = None
                     for k, v in self.application.bot_data.items():
@@ -790,28 +815,41 @@ class TelegramBot:
                         magnet_link = None
                         try:
                             # Try to get magnet link from database
-                            download_details = self.database.get_download_by_id(download_id)
-                            if download_details and len(download_details) > 4:
-                                magnet_link = download_details[4]  # magnet_link field
+                            download_details = await asyncio.to_thread(self.database.get_download_by_id, download_id)
+                            if download_details:
+                                magnet_link = download_details['magnet_link']
                         except Exception as e:
                             logger.debug(f"Could not get magnet link from database: {e}")
                         
-                        torrent_info = self.qbittorrent_client.find_torrent_by_name(title, magnet_link=magnet_link)
+                        torrent_info = await self.qbittorrent_client.find_torrent_by_name_async(title, magnet_link=magnet_link)
                         if torrent_info:
-                            torrent_hash = torrent_info['hash']
+                            torrent_hash = torrent_info.hash
                     if not torrent_hash:
                         logger.info(f"[Checker] No hash found for download {download_id} ({title})")
                         continue
                     if status == 'downloading':
-                        # Check if torrent is completed
-                        is_completed = self.qbittorrent_client.is_torrent_completed(torrent_hash)
-                        logger.info(f"[Checker] Download {download_id} ({title}) hash={torrent_hash} completed={is_completed}")
-                        if is_completed:
-                            # Update database
-                            self.database.update_download_status(download_id, 'completed')
-                            # Send notification
-                            await self._send_completion_notification(user_id, title)
-                await asyncio.sleep(60)  # Check every minute
+                        pending.append((user_id, download_id, title, torrent_hash))
+                # One qBittorrent sync per tick answers completion for every download
+                completed_hashes = await self.qbittorrent_client.get_completed_hashes_async() if pending else set()
+                for user_id, download_id, title, torrent_hash in pending:
+                    is_completed = torrent_hash.lower() in completed_hashes
+                    logger.info(f"[Checker] Download {download_id} ({title}) hash={torrent_hash} completed={is_completed}")
+                    if is_completed:
+                        # Update database
+                        await asyncio.to_thread(self.database.update_download_status, download_id, 'completed')
+                        # Send notification
+                        await self._send_completion_notification(user_id, title)
+                # Check every minute while downloads are running; back off while idle
+                if pending:
+                    self._check_interval = self.settings.CHECK_INTERVAL
+                else:
+                    self._check_interval = min(self._check_interval * 1.5, self.settings.CHECK_INTERVAL_MAX)
+                # Wait for the interval, or until a new download resets it
+                try:
+                    await asyncio.wait_for(self._check_wakeup.wait(), timeout=self._check_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._check_wakeup.clear()
             except Exception as e:
                 logger.error(f"Error checking completed downloads: {e}")
                 time.sleep(60)
@@ -894,7 +932,7 @@ class TelegramBot:
     async def _show_auto_download_rules(self, query, context):
         """Show current auto-download rules."""
         try:
-            rules = self.qbittorrent_client.get_auto_download_rules()
+            rules = await self.qbittorrent_client.get_auto_download_rules_async()
             
             if not rules:
                 text = "📋 **Auto-Download Rules**\n\nNo rules configured yet."
@@ -916,18 +954,13 @@ class TelegramBot:
                 # Process each rule safely
                 for i, rule in enumerate(rules_to_show):
                     try:
+                        rule_name = self.qbittorrent_client.rule_name(rule) or f'Rule {i+1}'
                         if isinstance(rule, dict):
-                            rule_name = rule.get('ruleName', rule.get('name', f'Rule {i+1}'))
                             enabled = "✅" if rule.get('enabled', False) else "❌"
-                        elif hasattr(rule, 'ruleName'):
-                            rule_name = rule.ruleName
-                            enabled = "✅" if getattr(rule, 'enabled', False) else "❌"
-                        elif hasattr(rule, 'name'):
-                            rule_name = rule.name
-                            enabled = "✅" if getattr(rule, 'enabled', False) else "❌"
-                        else:
-                            rule_name = str(rule)
+                        elif isinstance(rule, str):
                             enabled = "❓"
+                        else:
+                            enabled = "✅" if getattr(rule, 'enabled', False) else "❌"
                         
                         # Clean up the rule name for better display
                         clean_rule_name = rule_name.replace('Auto', '').replace('_', ' ').strip()
@@ -1010,19 +1043,14 @@ class TelegramBot:
                     # Check if ANY rule already exists for this movie title (regardless of quality)
                     logger.info(f"[MOVIE_RULE_CHECK] Checking if ANY rule exists for movie: '{title}'")
                     
-                    if self.qbittorrent_client.rule_exists_by_title(title):
+                    if await self.qbittorrent_client.rule_exists_by_title_async(title):
                         logger.info(f"[MOVIE_RULE_CHECK] ✅ Rule already exists for movie: '{title}'")
                         
                         # Get existing rule details
-                        existing_rule = self.qbittorrent_client.get_rule_by_title(title)
+                        existing_rule = await self.qbittorrent_client.get_rule_by_title_async(title)
                         existing_rule_name = "Unknown"
                         if existing_rule:
-                            if hasattr(existing_rule, 'name'):
-                                existing_rule_name = existing_rule.name
-                            elif hasattr(existing_rule, 'ruleName'):
-                                existing_rule_name = existing_rule.ruleName
-                            elif isinstance(existing_rule, dict):
-                                existing_rule_name = existing_rule.get('name') or existing_rule.get('ruleName')
+                            existing_rule_name = self.qbittorrent_client.rule_name(existing_rule)
                         
                         # Offer to replace the existing rule
                         keyboard = [
@@ -1089,19 +1117,14 @@ class TelegramBot:
                     # Check if ANY rule already exists for this TV show title (regardless of quality or season)
                     logger.info(f"[TV_RULE_CHECK] Checking if ANY rule exists for TV show: '{title}'")
                     
-                    if self.qbittorrent_client.rule_exists_by_title(title):
+                    if await self.qbittorrent_client.rule_exists_by_title_async(title):
                         logger.info(f"[TV_RULE_CHECK] ✅ Rule already exists for TV show: '{title}'")
                         
                         # Get existing rule details
-                        existing_rule = self.qbittorrent_client.get_rule_by_title(title)
+                        existing_rule = await self.qbittorrent_client.get_rule_by_title_async(title)
                         existing_rule_name = "Unknown"
                         if existing_rule:
-                            if hasattr(existing_rule, 'name'):
-                                existing_rule_name = existing_rule.name
-                            elif hasattr(existing_rule, 'ruleName'):
-                                existing_rule_name = existing_rule.ruleName
-                            elif isinstance(existing_rule, dict):
-                                existing_rule_name = existing_rule.get('name') or existing_rule.get('ruleName')
+                            existing_rule_name = self.qbittorrent_client.rule_name(existing_rule)
                         
                         # Offer to replace the existing rule
                         keyboard = [
@@ -1290,7 +1313,7 @@ class TelegramBot:
                     title = movie_data.get('title', 'Unknown')
                     
                     # Delete existing rule
-                    if self.qbittorrent_client.delete_rule_by_title(title):
+                    if await self.qbittorrent_client.delete_rule_by_title_async(title):
                         logger.info(f"[REPLACE_RULE] Deleted existing rule for movie: '{title}'")
                         
                         # Create new rule
@@ -1338,7 +1361,7 @@ class TelegramBot:
                     title = found_show.get('name', 'Unknown')
                     
                     # Delete existing rule
-                    if self.qbittorrent_client.delete_rule_by_title(title):
+                    if await self.qbittorrent_client.delete_rule_by_title_async(title):
                         logger.info(f"[REPLACE_RULE] Deleted existing rule for TV show: '{title}'")
                         
                         # Ask user for season number directly
@@ -1376,7 +1399,7 @@ class TelegramBot:
                 logger.info("[AUTO_CLEANUP] Starting automatic database cleanup...")
                 
                 # Clean up downloads older than 24 hours
-                deleted_count = self.database.cleanup_old_downloads(hours=24)
+                deleted_count = await asyncio.to_thread(self.database.cleanup_old_downloads, hours=24)
                 
                 if deleted_count > 0:
                     logger.info(f"[AUTO_CLEANUP] Cleaned up {deleted_count} old downloads")
@@ -1,11 +1,16 @@
 import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of concurrent detail requests when fetching several titles at once
+MAX_PARALLEL_REQUESTS = 5
+
 class TMDBClient:
     def __init__(self):
         self.api_key = Settings.TMDB_API_KEY
@@ -14,6 +19,9 @@ class TMDBClient:
         # Use Bearer token authentication
         self.session.headers['Authorization'] = f'Bearer {self.api_key}'
         self.session.headers['accept'] = 'application/json'
+        # Keep enough pooled keep-alive connections for the parallel detail lookups
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_PARALLEL_REQUESTS)
+        self.session.mount('https://', adapter)
     
     def search_movie(self, query: str) -> List[Dict]:
         """Search for movies by title."""
@@ -28,8 +36,8 @@ class TMDBClient:
             response.raise_for_status()
             data = response.json()
             
-            # Log the response for inspection
-            logger.info(f"[TMDB] Movie search response for '{query}': {data}")
+            # Log the response for inspection (only rendered when DEBUG is enabled)
+            logger.debug("[TMDB] Movie search response for '%s': %s", query, data)
             
             return data.get('results', [])
         except Exception as e:
@@ -65,8 +73,8 @@ class TMDBClient:
             response.raise_for_status()
             data = response.json()
             
-            # Log the response for inspection
-            logger.info(f"[TMDB] Movie details response for ID {movie_id}: {data}")
+            # Log the response for inspection (only rendered when DEBUG is enabled)
+            logger.debug("[TMDB] Movie details response for ID %s: %s", movie_id, data)
             
             return data
         except Exception as e:
@@ -84,14 +92,30 @@ class TMDBClient:
             response.raise_for_status()
             data = response.json()
             
-            # Log the response for inspection
-            logger.info(f"[TMDB] TV show details response for ID {tv_id}: {data}")
+            # Log the response for inspection (only rendered when DEBUG is enabled)
+            logger.debug("[TMDB] TV show details response for ID %s: %s", tv_id, data)
             
             return data
         except Exception as e:
             logger.error(f"Error getting TV show details: {e}")
             return None
     
+    def get_tv_show_details_many(self, tv_ids: List[int]) -> Dict[int, Optional[Dict]]:
+        """
+        Get detailed information for several TV shows concurrently.
+        
+        Args:
+            tv_ids: TMDB TV show IDs
+        
+        Returns:
+            Mapping of TV show ID to its details (None if the lookup failed)
+        """
+        if not tv_ids:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_REQUESTS, len(tv_ids))) as executor:
+            return dict(zip(tv_ids, executor.map(self.get_tv_show_details, tv_ids)))
+    
     def is_show_in_production(self, tv_data: Dict) -> bool:
         """Check if a TV show is in production."""
         in_production = tv_data.get('in_production', False)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Database tests for QbitRemoteDownloader
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from models.database import Database
+
+def _temp_database() -> Database:
+    """Create a database in a throwaway directory."""
+    return Database(os.path.join(tempfile.mkdtemp(), "test.db"))
+
+def test_downloads():
+    """Test adding downloads and updating their status."""
+    try:
+        db = _temp_database()
+        download_id = db.add_download(1, "Movie", "guid-1", "magnet:?xt=1", "/movies/Movie")
+        db.add_download(1, "Show", "guid-2", "magnet:?xt=2", "/tv/Show")
+        db.update_download_status(download_id, 'completed')
+
+        downloads = db.get_user_downloads(1)
+        assert len(downloads) == 2
+
+        download = db.get_download_by_id(download_id)
+        assert download['title'] == "Movie"
+        assert download['magnet_link'] == "magnet:?xt=1"
+        assert download['status'] == 'completed'
+        assert db.get_download_by_id(download_id + 100) is None
+
+        stats = db.get_download_statistics(1)
+        assert stats['total_downloads'] == 2
+        assert stats['completed_downloads'] == 1
+        assert stats['downloading_count'] == 1
+        print("✅ Downloads stored and counted correctly")
+        return True
+    except Exception as e:
+        print(f"❌ Downloads error: {e!r}")
+        return False
+
+def test_user_sessions():
+    """Test creating, updating and clearing user sessions."""
+    try:
+        db = _temp_database()
+        db.update_user_session(1, 'waiting_for_search_query', 'dune', 2)
+        assert db.get_user_session(1) == {
+            'current_state': 'waiting_for_search_query',
+            'search_query': 'dune',
+            'current_page': 2
+        }
+
+        db.create_user_session(1, 'idle')
+        assert db.get_user_session(1) == {
+            'current_state': 'idle',
+            'search_query': None,
+            'current_page': 0
+        }
+
+        db.clear_user_session(1)
+        assert db.get_user_session(1) is None
+        print("✅ User sessions work correctly")
+        return True
+    except Exception as e:
+        print(f"❌ User session error: {e!r}")
+        return False
+
+def test_timestamp_migration():
+    """Test opening a database created with the old TIMESTAMP text columns."""
+    try:
+        db_path = os.path.join(tempfile.mkdtemp(), "old.db")
+        # SQLite's CURRENT_TIMESTAMP format: UTC, 'YYYY-MM-DD HH:MM:SS'
+        recent = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0) - timedelta(hours=1)
+        stale = recent - timedelta(hours=48)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute('''
+                CREATE TABLE downloads (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    title TEXT NOT NULL,
+                    torrent_id TEXT NOT NULL,
+                    magnet_link TEXT NOT NULL,
+                    download_path TEXT NOT NULL,
+                    status TEXT DEFAULT 'downloading',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    completed_at TIMESTAMP NULL
+                )
+            ''')
+            rows = [
+                (1, "Recent", "guid-1", "magnet:?xt=1", "/movies/Recent", 'completed', str(recent), str(recent)),
+                (1, "Active", "guid-2", "magnet:?xt=2", "/tv/Active", 'downloading', str(recent), None),
+                (1, "Stale", "guid-3", "magnet:?xt=3", "/movies/Stale", 'completed', str(stale), str(stale)),
+            ]
+            conn.executemany('''
+                INSERT INTO downloads
+                (user_id, title, torrent_id, magnet_link, download_path, status, created_at, completed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+
+        db = Database(db_path)
+
+        column_types = {row['name']: row['type'] for row in db._conn.execute('PRAGMA table_info(downloads)')}
+        assert column_types['created_at'] == 'INTEGER'
+        assert column_types['completed_at'] == 'INTEGER'
+        stored = {row['title']: (row['created_at'], row['completed_at'])
+                  for row in db._conn.execute('SELECT title, created_at, completed_at FROM downloads')}
+        recent_ts = int(recent.replace(tzinfo=timezone.utc).timestamp())
+        stale_ts = int(stale.replace(tzinfo=timezone.utc).timestamp())
+        assert stored == {
+            "Recent": (recent_ts, recent_ts),
+            "Active": (recent_ts, None),
+            "Stale": (stale_ts, stale_ts),
+        }
+
+        downloads = db.get_user_downloads(1)
+        assert sorted(row['title'] for row in downloads) == ["Active", "Recent"]
+        recent_row = next(row for row in downloads if row['title'] == "Recent")
+        assert recent_row['created_at'] == str(recent)
+        assert recent_row['completed_at'] == str(recent)
+        assert len(db.get_user_downloads(1, hours=72)) == 3
+
+        stats = db.get_download_statistics(1)
+        assert stats['total_downloads'] == 2
+        assert stats['completed_downloads'] == 1
+        assert stats['downloading_count'] == 1
+
+        assert db.cleanup_old_downloads(24) == 1
+        assert len(db.get_user_downloads(1, hours=72)) == 2
+        print("✅ Old timestamp columns migrated correctly")
+        return True
+    except Exception as e:
+        print(f"❌ Timestamp migration error: {e!r}")
+        return False
+
+if __name__ == "__main__":
+    print("🧪 Running database tests...\n")
+
+    tests = [
+        test_downloads,
+        test_user_sessions,
+        test_timestamp_migration
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        if test():
+            passed += 1
+        print()
+
+    print(f"📊 Test Results: {passed}/{total} tests passed")
+
+    if passed == total:
+        print("🎉 All tests passed!")
+        sys.exit(0)
+    else:
+        print("❌ Some tests failed!")
+        sys.exit(1)
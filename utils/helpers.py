@@ -7,6 +7,11 @@ from urllib.parse import urlparse, parse_qs
 
 logger = logging.getLogger(__name__)
 
+# Telegram bot tokens look like 1234567890:ABCdefGHIjklMNOpqrsTUVwxyz
+_TELEGRAM_TOKEN_RE = re.compile(r'^\d+:[A-Za-z0-9_-]+$')
+# TorrentLeech API tokens are typically alphanumeric and 32+ characters
+_TORRENTLEECH_TOKEN_RE = re.compile(r'^[A-Za-z0-9]{32,}$')
+
 def setup_logging(level: str = "INFO") -> None:
     """Setup logging configuration."""
     logging.basicConfig(
@@ -72,19 +77,14 @@ def validate_telegram_token(token: str) -> bool:
     if not token:
         return False
     
-    # Telegram bot tokens are typically 46 characters long and contain letters, numbers, and colons
-    # Format: 1234567890:ABCdefGHIjklMNOpqrsTUVwxyz
-    pattern = r'^\d+:[A-Za-z0-9_-]+$'
-    return bool(re.match(pattern, token))
+    return bool(_TELEGRAM_TOKEN_RE.match(token))
 
 def validate_torrentleech_token(token: str) -> bool:
     """Validate TorrentLeech API token format."""
     if not token:
         return False
     
-    # TorrentLeech API tokens are typically alphanumeric and 32+ characters
-    pattern = r'^[A-Za-z0-9]{32,}$'
-    return bool(re.match(pattern, token))
+    return bool(_TORRENTLEECH_TOKEN_RE.match(token))
 
 def truncate_text(text: str, max_length: int = 100) -> str:
     """Truncate text to specified length."""